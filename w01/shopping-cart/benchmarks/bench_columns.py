@@ -0,0 +1,42 @@
+"""
+Compares the memory and scan speed of the columnar items against the dicts
+
+Run from the shopping-cart folder:
+    python -m benchmarks.bench_columns --size 1000000
+"""
+import argparse
+import time
+import tracemalloc
+from benchmarks.bench_search import random_items
+from shopping_cart.columns import ItemColumns, np
+from shopping_cart.store import sum_prices
+
+def allocated(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def timed(name: str, function):
+    start = time.perf_counter()
+    function()
+    print(f"{name:>28} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    items, dict_size = allocated(lambda: random_items(args.size))
+    columns, columns_size = allocated(lambda: ItemColumns.from_items(items.items()))
+    print(f"NumPy: {'yes' if np is not None else 'no'}")
+    print(f"{'dicts':>28} {dict_size / args.size:>10.0f} bytes/item")
+    print(f"{'columns':>28} {columns_size / args.size:>10.0f} bytes/item")
+
+    timed("total, dicts", lambda: sum_prices(items.values()))
+    timed("total, columns", columns.total_price)
+    timed("filter by type, dicts", lambda: [item_id for item_id, item_data in items.items() if item_data["type"].lower() == "fruit"])
+    timed("filter by type, columns", lambda: columns.indices_of_type("fruit"))
+    timed("sort by price, dicts", lambda: sorted(items.items(), key=lambda pair: pair[1]["price"]))
+    timed("sort by price, columns", columns.sorted_indices)
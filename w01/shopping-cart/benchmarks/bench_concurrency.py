@@ -0,0 +1,54 @@
+"""
+Stress test of several processes adding items to one shared JSON database
+
+Every worker adds its items one by one through its own Cart, then the
+database is checked for lost writes. Run from the shopping-cart folder:
+    python -m benchmarks.bench_concurrency --workers 8 --items 200
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from shopping_cart.cart import Cart
+from shopping_cart.item import Item
+
+def add_items_worker(database_path: str, worker: int, count: int, journal: bool = False):
+    cart = Cart(database_path=database_path, journal=journal)
+    for i in range(count):
+        cart.add_item_to_cart(Item(name=f"Item {worker}-{i}", type="Stress", _price=1.0, _id=f"W{worker:03d}I{i:06d}"), verbose=0)
+
+def run(database_path: str, workers: int, count: int, journal: bool = False) -> float:
+    """
+    Runs the workers against the database
+
+    Returns:
+        float: The wall time in seconds
+    """
+    processes = [
+        multiprocessing.Process(target=add_items_worker, args=(database_path, worker, count, journal))
+        for worker in range(workers)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--journal", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "database.json")
+        elapsed = run(database_path, args.workers, args.items, args.journal)
+        found = Cart(database_path=database_path).get_total_item_count()
+
+    expected = args.workers * args.items
+    print(f"{args.workers} workers added {found}/{expected} items in {elapsed:.2f}s ({found / elapsed:.0f} adds/s)")
+    if found != expected:
+        raise SystemExit(f"{expected - found} writes were lost")
@@ -0,0 +1,25 @@
+"""
+Compares the throughput and collisions of the item id formats
+
+Run from the shopping-cart folder:
+    python -m benchmarks.bench_ids --count 1000000
+"""
+import argparse
+import time
+from shopping_cart.random_number_utils import RandomNumberUtils
+
+def measure(name: str, generate):
+    start = time.perf_counter()
+    ids = generate()
+    elapsed = time.perf_counter() - start
+    collisions = len(ids) - len(set(ids))
+    print(f"{name:>22} {len(ids) / elapsed / 1e6:>8.2f} M ids/s {collisions:>10} collisions")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    measure("random (6 letters)", lambda: [RandomNumberUtils.generate_random_id() for _ in range(args.count)])
+    measure("sortable, one by one", lambda: [RandomNumberUtils.generate_sortable_id() for _ in range(args.count)])
+    measure("sortable, batch", lambda: RandomNumberUtils.generate_sortable_ids(args.count))
@@ -0,0 +1,55 @@
+"""
+Compares Cart search latency with the trigram index against a full scan
+
+Run from the shopping-cart folder:
+    python -m benchmarks.bench_search --sizes 1000 100000 1000000
+"""
+import argparse
+import random
+import string
+import tempfile
+import time
+from shopping_cart.store import ItemStore, JsonItemStore
+
+TYPES = ["Fruit", "Vegetable", "Drink", "Dairy", "Bakery", "Frozen", "Snack", "Household"]
+QUERIES = ["apple", "vegetable", "qzx", "mi"]
+
+def random_items(count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    items = {}
+    for i in range(count):
+        name = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12))).capitalize()
+        if i % 1000 == 0:
+            name = f"{name} Apple"
+        items[f"ITEM{i:08d}"] = {"name": name, "type": rng.choice(TYPES), "price": round(rng.uniform(0.5, 50.0), 2)}
+    return items
+
+def median_time(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def run(sizes, repeat):
+    print(f"{'items':>10} {'query':>10} {'hits':>8} {'scan ms':>10} {'index ms':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            store = JsonItemStore(f"{directory}/database_{size}.json", flush_interval=None)
+            store.data["Items"].update(random_items(size))
+            build = median_time(lambda: store.index, 1)
+            for query in QUERIES:
+                hits = len(store.search(query))
+                scan = median_time(lambda: ItemStore.search(store, query), repeat)
+                indexed = median_time(lambda: store.search(query), repeat)
+                print(f"{size:>10} {query:>10} {hits:>8} {scan * 1000:>10.2f} {indexed * 1000:>10.2f} {scan / indexed:>7.1f}x")
+            print(f"{size:>10} index built in {build * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
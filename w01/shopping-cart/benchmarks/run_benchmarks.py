@@ -0,0 +1,149 @@
+"""
+Benchmark suite of the Cart operations at scale
+
+Times add, bulk add, search, remove, totals and empty on carts pre-filled
+with each of the given sizes, writes the results as JSON and optionally
+compares them with a previous run, failing when an operation got slower
+than the threshold allows. Run from the shopping-cart folder:
+    python -m benchmarks.run_benchmarks --sizes 1000 100000 1000000 --output results.json
+    python -m benchmarks.run_benchmarks --output new.json --compare results.json --threshold 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.bench_search import random_items
+from shopping_cart.cart import Cart
+from shopping_cart.item import Item
+
+BULK_SIZE = 1000
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def measure(operation, repeat: int, setup=None) -> dict:
+    """
+    Times an operation, running the optional setup untimed before each run
+
+    Returns:
+        dict: The median and minimum time in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        # The cart prints its results, keep them out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            operation()
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {"median_s": timings[len(timings) // 2], "min_s": timings[0], "repeat": repeat}
+
+def new_items(count: int, prefix: str) -> list[Item]:
+    return [Item(name=f"Bench {prefix} {i}", type="Bench", _price=1.5, _id=f"{prefix}{i:08d}") for i in range(count)]
+
+def bench_cart(backend: str, size: int, repeat: int, directory: str) -> dict:
+    """
+    Runs every operation on a cart pre-filled with `size` items
+    """
+    extension = "db" if backend == "sqlite" else "json"
+    cart = Cart(database_path=os.path.join(directory, f"{backend}_{size}.{extension}"), backend=backend)
+    items = [
+        Item(name=item_data["name"], type=item_data["type"], _price=item_data["price"], _id=item_id)
+        for item_id, item_data in random_items(size).items()
+    ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        cart.empty_cart()
+    cart.add_items(items)
+
+    single = new_items(repeat, "ADD")
+    batches = [new_items(BULK_SIZE, f"BULK{run}") for run in range(repeat)]
+    results = {
+        "add": measure(lambda: cart.add_item_to_cart(single.pop(), verbose=0), repeat),
+        "bulk_add": measure(lambda: cart.add_items(batches.pop()), repeat),
+        "search": measure(lambda: cart.search_items("apple"), repeat),
+        "remove": measure(
+            lambda: cart.remove_items(["REMOVE"]), repeat,
+            setup=lambda: cart.add_item_to_cart(Item(name="Remove", type="Bench", _id="REMOVE"), verbose=0),
+        ),
+        "totals": measure(lambda: (cart.get_total_price_of_items(), cart.get_total_item_count()), repeat),
+        "empty": measure(cart.empty_cart, repeat, setup=lambda: cart.add_items(items)),
+    }
+    cart.flush()
+    return results
+
+def run(backends, sizes, repeat: int) -> dict:
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in backends:
+            for size in sizes:
+                for operation, timing in bench_cart(backend, size, repeat, directory).items():
+                    name = f"{backend}/{operation}/{size}"
+                    report["results"][name] = timing
+                    print(f"{name:>28} {timing['median_s'] * 1000:>10.2f} ms")
+    return report
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compares the median times of two reports
+
+    Args:
+        current (dict): The report of this run
+        baseline (dict): The report to compare with
+        threshold (float): The tolerated slowdown, 0.2 allows 20% slower
+
+    Returns:
+        list[str]: The benchmarks that regressed beyond the threshold
+    """
+    regressions = []
+    for name, timing in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = timing["median_s"] / previous["median_s"]
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:>28} {previous['median_s'] * 1000:>10.2f} ms -> {timing['median_s'] * 1000:>10.2f} ms {ratio:>6.2f}x {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["json"], choices=["json", "stream", "sqlite"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="where to write the JSON results")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="tolerated slowdown ratio, default 0.2")
+    args = parser.parse_args()
+
+    report = run(args.backends, args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=4)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"\nCompared with {baseline.get('commit')} ({baseline.get('timestamp')}):")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            sys.exit(f"{len(regressions)} benchmarks regressed by more than {args.threshold:.0%}")
@@ -9,9 +9,11 @@ if __name__ == "__main__":
     my_cart.empty_cart()
 
     # init database with fruits
-    my_cart.add_item_to_cart(Item(name="Apple", type="Fruit", _price=1.0))
-    my_cart.add_item_to_cart(Item(name="Banana", type="Fruit", _price=2.0))
-    my_cart.add_item_to_cart(Item(name="Cherry", type="Fruit", _price=3.0))
+    my_cart.add_items([
+        Item(name="Apple", type="Fruit", _price=1.0),
+        Item(name="Banana", type="Fruit", _price=2.0),
+        Item(name="Cherry", type="Fruit", _price=3.0),
+    ], verbose=1)
 
     # search for an item
     print("Searching for 'apple'...")
@@ -1,7 +1,8 @@
-import json
 from dataclasses import dataclass, field
 from shopping_cart.item import Item
 from shopping_cart.file_io import FStream
+from shopping_cart.store import ItemStore, JsonItemStore, StreamingJsonItemStore
+from shopping_cart.sqlite_store import SqliteItemStore
 from shopping_cart.random_number_utils import RandomNumberUtils
 
 @dataclass
@@ -9,11 +10,40 @@ class Cart:
     database_path: str
     isEmpty: bool = True
     isActive: bool = False
-    id: str = field(default_factory=RandomNumberUtils.generate_random_id)
+    id: str = field(default_factory=RandomNumberUtils.generate_id)
+    backend: str = "json"
+    flush_interval: float | None = 0.0
+    journal: bool = False
+    verify: bool = False
+    store: ItemStore | None = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.store is not None:
+            return
+        if self.backend == "json":
+            self.store = JsonItemStore(self.database_path, flush_interval=self.flush_interval, journal=self.journal)
+        elif self.backend == "stream":
+            self.store = StreamingJsonItemStore(self.database_path)
+        elif self.backend == "sqlite":
+            self.store = SqliteItemStore(self.database_path, flush_interval=self.flush_interval)
+        else:
+            raise ValueError(f"Unknown storage backend '{self.backend}', expected 'json', 'stream' or 'sqlite'")
+
+    def _update_state(self):
+        self.isEmpty = self.store.count() == 0
+        self.isActive = not self.isEmpty
+
+    def _check_totals(self):
+        """
+        In verify mode, recomputes the totals after a change and checks them
+        against the running ones maintained by the store
+        """
+        if self.verify:
+            self.store.verify_totals()
 
     def get_all_items(self, verbose=0) -> dict:
         """
-        Reads and returns a hash map of all the available items
+        Returns a hash map of all the available items
 
         Args:
             if verbose is 1, it will print the hash map of the items
@@ -21,24 +51,25 @@ class Cart:
         Returns:
             dict: A hash map with the items
         """
-        data_file = FStream.load_json_file(self.database_path)
-
-        # Convert Items from list to dict if needed (for backward compatibility)
-        if isinstance(data_file.get("Items"), list):
-            data_file["Items"] = {}
+        data_file = self.store.as_dict()
 
-        if len(data_file.items()) > 0:
+        if len(data_file["Items"]) > 0:
             self.isEmpty = False
             self.isActive = True
 
         try:
             if verbose == 1:
-                FStream.print_json_structure(data_file)
+                self.print_items()
             
             return data_file
         except:
             raise ValueError("The value for the verbose has to be 0 or 1")
 
+    def print_items(self):
+        """
+        Prints the items of the cart one by one, streamed from the store
+        """
+        FStream.print_items(self.store.iter_items())
 
     def search_items(self, query: str) -> list[Item]:
         """
@@ -49,12 +80,9 @@ class Cart:
         Returns:
             list[Item]: A list of items that match the query
         """
-        data_file = FStream.load_json_file(self.database_path)
         results = []
-        for item_id, item_data in data_file["Items"].items():
-            item = Item(name=item_data["name"], type=item_data["type"], _price=item_data["price"], _id=item_id)
-            if query.lower() in item.search_string.lower():
-                results.append(item)
+        for item_id, item_data in self.store.search(query):
+            results.append(Item(name=item_data["name"], type=item_data["type"], _price=item_data["price"], _id=item_id))
 
         if len(results) == 0:
             print("No items found matching the query")
@@ -64,6 +92,36 @@ class Cart:
         
         return results
 
+    def get_items_by_type(self, type: str) -> list[Item]:
+        """
+        Returns the items of a given type, ignoring case
+
+        Args:
+            type (str): The type of the items
+        Returns:
+            list[Item]: The items of that type, in insertion order
+        """
+        return [
+            Item(name=item_data["name"], type=item_data["type"], _price=item_data["price"], _id=item_id)
+            for item_id, item_data in self.store.get_items_by_type(type)
+        ]
+
+    def get_sorted_items(self, key: str = "price", reverse: bool = False) -> list[Item]:
+        """
+        Returns the items of the cart sorted on one of their fields
+
+        Args:
+            key (str): "price", "name", "type" or "id"
+            reverse (bool): Sort in descending order
+        Returns:
+            list[Item]: The sorted items
+        """
+        columns = self.store.columns()
+        return [
+            Item(name=item_data["name"], type=item_data["type"], _price=item_data["price"], _id=item_id)
+            for item_id, item_data in columns.items(columns.sorted_indices(key, reverse))
+        ]
+
     def get_total_item_count(self) -> int:
         """
         Returns the total number of items in the cart
@@ -71,27 +129,75 @@ class Cart:
         Returns:
             int: The total number of items in the cart
         """
-        data_file = self.get_all_items()
-        return len(data_file["Items"].items())
+        return self.store.count()
 
-    def add_item_to_cart(self, item: Item):
+    def add_item_to_cart(self, item: Item, verbose=1):
         """
         Adds an item to the cart
 
         Args:
             item (Item): The item to add to the cart
+            if verbose is 1, it will print the added item
         """
-        data = self.get_all_items()
         new_item = {"name": item.name, "type": item.type, "price": item.price}
-        data["Items"][item._id] = new_item
-
-        with open(self.database_path, 'w') as data_file:
-            json.dump(data, data_file, indent=4)
+        self.store.add(item._id, new_item)
+        self._check_totals()
 
         self.isEmpty = False
         self.isActive = True
 
-        print(f"Added item {item.name} to the cart")
+        if verbose == 1:
+            print(f"Added item {item.name} to the cart")
+
+    def add_items(self, items, verbose=0) -> int:
+        """
+        Adds a batch of items to the cart with a single write to the database
+
+        Args:
+            items (Iterable[Item]): The items to add to the cart
+            if verbose is 1, it will print every added item
+
+        Returns:
+            int: The number of items added
+        """
+        new_items = [(item._id, {"name": item.name, "type": item.type, "price": item.price}) for item in items]
+        self.store.add_many(new_items)
+        self._check_totals()
+
+        if new_items:
+            self.isEmpty = False
+            self.isActive = True
+
+        if verbose == 1:
+            for _, item_data in new_items:
+                print(f"Added item {item_data['name']} to the cart")
+
+        return len(new_items)
+
+    def remove_items(self, item_ids, verbose=0) -> int:
+        """
+        Removes a batch of items from the cart with a single write to the database
+
+        Args:
+            item_ids (Iterable[str]): The ids of the items to remove
+            if verbose is 1, it will print every removed item
+
+        Returns:
+            int: The number of items removed
+
+        Raises:
+            KeyError: If one of the ids is not in the cart, nothing is removed then
+        """
+        removed = self.store.remove_many(list(item_ids))
+        self._check_totals()
+
+        if verbose == 1:
+            for item_data in removed:
+                print(f"Removed item {item_data['name']} from the cart")
+
+        self._update_state()
+
+        return len(removed)
 
     def remove_item_from_cart(self, query: str):
         """
@@ -100,28 +206,19 @@ class Cart:
         Args:
             query (str): The query to remove the item from the cart
         """
-        data = self.get_all_items()
-        items_to_remove = []
-
-        for item_id, item_data in data["Items"].items():
-            if query.lower() in item_data["name"].lower() or query.lower() in item_data["type"].lower():
-                items_to_remove.append(item_id)
+        items_to_remove = self.store.match(query)
 
         if not items_to_remove:
             print(f"No items found matching the query matching '{query}'")
             return
 
-        for item_id in items_to_remove:
-            item_name = data["Items"][item_id]["name"]
-            del data["Items"][item_id]
-            print(f"Removed item {item_name} from the cart")
+        removed = self.store.remove_many(items_to_remove)
+        self._check_totals()
 
-        with open(self.database_path, 'w') as file:
-            json.dump(data, file, indent=4)
+        for item_data in removed:
+            print(f"Removed item {item_data['name']} from the cart")
 
-        if not data["Items"]:
-            self.isEmpty = True
-            self.isActive = False
+        self._update_state()
 
         print(f"Removed all items matching the query '{query}' from the cart")
 
@@ -130,10 +227,9 @@ class Cart:
         Remove the selected item by index
         """
 
-        data = self.get_all_items()
         items = []
         i = 0
-        for item_id, item_data in data["Items"].items():
+        for item_id, item_data in self.store.items.items():
             items.append(item_id)
             print(f"{i}: {item_data}")
             i += 1
@@ -146,17 +242,11 @@ class Cart:
             print("Item not found")
             return
 
-        item_to_remove = items[usr_choice]
-        item_name = data["Items"][item_to_remove]["name"]
-        del data["Items"][item_to_remove]
-        print(f"Removed item {item_name} from the cart")
-
-        with open(self.database_path, 'w') as file:
-            json.dump(data, file, indent=4)
+        item_data = self.store.remove(items[usr_choice])
+        self._check_totals()
+        print(f"Removed item {item_data['name']} from the cart")
 
-        if not data["Items"]:
-            self.isEmpty = True
-            self.isActive = False
+        self._update_state()
 
     def get_total_price_of_items(self) -> float:
         """
@@ -165,27 +255,33 @@ class Cart:
         Returns:
             float: The total price of the items in the cart
         """
-        data = self.get_all_items()
-        total = 0.0
-        for item_id, item_data in data["Items"].items():
-            total += item_data["price"]
-        return total
+        return float(self.store.total_price())
 
     def empty_cart(self):
         """
         Clear all the items from the cart
         """
-        data = self.get_all_items()
-        if len(data["Items"].items()) > 0:
-            data = {"Items": {}}
-            with open(self.database_path, 'w') as file:
-                json.dump(data, file, indent=4)
+        if self.store.count() > 0:
+            self.store.clear()
+            self._check_totals()
             self.isEmpty = True
             self.isActive = False
             print("Cart emptied")
         else:
             print("Cart is already empty")
 
+    def flush(self):
+        """
+        Writes the pending changes of the cart to the database
+        """
+        self.store.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
 
 # @dataclass
 # class Cart:
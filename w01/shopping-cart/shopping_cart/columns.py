@@ -0,0 +1,145 @@
+from array import array
+from dataclasses import dataclass, field
+from decimal import Decimal
+from shopping_cart.item import CENT, exact_price
+
+try:
+    import numpy as np
+except ImportError:  # the columns work without NumPy, only slower
+    np = None
+
+@dataclass
+class StringColumn:
+    """
+    Strings packed in a single UTF-8 buffer, with their end offsets
+    """
+    _data: bytearray = field(default_factory=bytearray, repr=False)
+    _ends: array = field(default_factory=lambda: array('Q'), repr=False)
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, index: int) -> str:
+        start = self._ends[index - 1] if index > 0 else 0
+        return self._data[start:self._ends[index]].decode()
+
+    def append(self, value: str):
+        self._data += value.encode()
+        self._ends.append(len(self._data))
+
+    def nbytes(self) -> int:
+        return len(self._data) + self._ends.itemsize * len(self._ends)
+
+@dataclass
+class ItemColumns:
+    """
+    Columnar, read-only snapshot of the items of a cart
+
+    Each field of the items is stored in its own compact array: ids and names
+    as packed strings, types as 16 bit codes into `types`, and prices as whole
+    cents. Scans such as totals, type filters and sorts run over the arrays,
+    vectorized with NumPy when it is installed.
+    """
+    ids: StringColumn = field(default_factory=StringColumn)
+    names: StringColumn = field(default_factory=StringColumn)
+    types: list[str] = field(default_factory=list)
+    type_codes: array = field(default_factory=lambda: array('H'))
+    cents: array = field(default_factory=lambda: array('q'))
+    _type_lookup: dict = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_items(cls, items) -> "ItemColumns":
+        """
+        Builds the columns from (item_id, item_data) pairs
+
+        Args:
+            items: The (item_id, item_data) pairs, they can be streamed
+        """
+        columns = cls()
+        for item_id, item_data in items:
+            columns.append(item_id, item_data)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    def append(self, item_id: str, item_data: dict):
+        code = self._type_lookup.get(item_data["type"])
+        if code is None:
+            code = self._type_lookup[item_data["type"]] = len(self.types)
+            self.types.append(item_data["type"])
+        self.ids.append(item_id)
+        self.names.append(item_data["name"])
+        self.type_codes.append(code)
+        self.cents.append(int(exact_price(item_data["price"]) / CENT))
+
+    def item(self, index: int) -> tuple[str, dict]:
+        """
+        Returns the (item_id, item_data) pair stored at an index
+        """
+        price = float(Decimal(self.cents[index]) * CENT)
+        return self.ids[index], {"name": self.names[index], "type": self.types[self.type_codes[index]], "price": price}
+
+    def items(self, indices=None) -> list[tuple[str, dict]]:
+        """
+        Returns the (item_id, item_data) pairs at the given indices, all by default
+        """
+        if indices is None:
+            indices = range(len(self))
+        return [self.item(index) for index in indices]
+
+    def total_price(self) -> Decimal:
+        """
+        Returns the exact sum of the prices
+        """
+        if np is not None:
+            cents = int(np.frombuffer(self.cents, dtype=np.int64).sum())
+        else:
+            cents = sum(self.cents)
+        return (Decimal(cents) * CENT).quantize(CENT)
+
+    def indices_of_type(self, type: str) -> list[int]:
+        """
+        Returns the indices of the items of a given type, ignoring case
+        """
+        codes = [code for code, name in enumerate(self.types) if name.lower() == type.lower()]
+        if not codes:
+            return []
+        if np is not None:
+            mask = np.isin(np.frombuffer(self.type_codes, dtype=np.uint16), codes)
+            return np.flatnonzero(mask).tolist()
+        codes = set(codes)
+        return [index for index, code in enumerate(self.type_codes) if code in codes]
+
+    def sorted_indices(self, key: str = "price", reverse: bool = False) -> list[int]:
+        """
+        Returns the indices of the items sorted by price, name, type or id,
+        keeping the insertion order of equal keys
+
+        Args:
+            key (str): The field to sort on
+            reverse (bool): Sort in descending order
+        """
+        if key == "price":
+            if np is not None:
+                cents = np.frombuffer(self.cents, dtype=np.int64)
+                order = np.argsort(-cents if reverse else cents, kind="stable")
+                return order.tolist()
+            return sorted(range(len(self)), key=self.cents.__getitem__, reverse=reverse)
+        if key == "type":
+            return sorted(range(len(self)), key=lambda index: self.types[self.type_codes[index]], reverse=reverse)
+        if key == "name":
+            return sorted(range(len(self)), key=self.names.__getitem__, reverse=reverse)
+        if key == "id":
+            return sorted(range(len(self)), key=self.ids.__getitem__, reverse=reverse)
+        raise ValueError(f"Cannot sort items by '{key}', expected 'price', 'name', 'type' or 'id'")
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory used by the columns, in bytes
+        """
+        return (
+            self.ids.nbytes() + self.names.nbytes()
+            + self.type_codes.itemsize * len(self.type_codes)
+            + self.cents.itemsize * len(self.cents)
+        )
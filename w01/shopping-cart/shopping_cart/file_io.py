@@ -1,7 +1,108 @@
 import json
 import os
+import tempfile
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 
+CHUNK_SIZE = 64 * 1024
+# Room kept at the top of a streamed file to write its header once known
+HEADER_SIZE = 256
+_decoder = json.JSONDecoder()
+
+@contextmanager
+def atomic_open(path):
+    """
+    Open a temporary file next to `path` for writing, which replaces `path`
+    once the block exits without error
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        # mkstemp creates a private file, keep the permissions of the database instead
+        mode = os.stat(path).st_mode if os.path.exists(path) else 0o644
+        os.chmod(tmp_path, mode & 0o777)
+        with os.fdopen(fd, 'w') as data_file:
+            yield data_file
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+class _JsonReader:
+    """
+    Incremental reader of a JSON document, keeping only a chunk in memory
+    """
+
+    def __init__(self, data_file, chunk_size):
+        self.data_file = data_file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.data_file.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def peek(self) -> str:
+        """
+        Returns the next non blank character without consuming it
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of the JSON file")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at '{self.buffer[self.pos:self.pos + 20]}'")
+        self.pos += 1
+
+    def value(self):
+        """
+        Decodes the next JSON value, reading more of the file until it is complete
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self):
+        """
+        Iterates over the (key, reader) pairs of the object starting here,
+        the value of each key must be consumed before the next iteration
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect("}")
+                return
+
 @dataclass
 class FStream:
     name: str
@@ -21,12 +122,183 @@ class FStream:
             dict: A hash map with the JSON structure
         """
         with open(path, 'rb') as data_file:
-            cls.data_file = json.load(data_file)
+            return json.load(data_file)
+
+    @staticmethod
+    def iter_items(path, chunk_size=CHUNK_SIZE):
+        """
+        Stream the items of a JSON database without loading the whole file
+
+        Only a chunk of the file and the current item are held in memory.
 
-        return cls.data_file
+        Args:
+            path: The path for the JSON database to read
+            chunk_size: The number of characters read from the file at once
+
+        Yields:
+            tuple[str, dict]: The (item_id, item_data) pairs
+        """
+        with open(path, 'r') as data_file:
+            reader = _JsonReader(data_file, chunk_size)
+            for key in reader.members():
+                if key == "Items" and reader.peek() == "{":
+                    for item_id in reader.members():
+                        yield item_id, reader.value()
+                else:
+                    reader.value()
+
+    @staticmethod
+    def load_json_header(path, chunk_size=CHUNK_SIZE) -> dict:
+        """
+        Read the top-level entries of a JSON database written before its items,
+        without reading the items
+
+        Args:
+            path: The path for the JSON database to read
+            chunk_size: The number of characters read from the file at once
 
+        Returns:
+            dict: The entries found before "Items"
+        """
+        header = {}
+        with open(path, 'r') as data_file:
+            reader = _JsonReader(data_file, chunk_size)
+            for key in reader.members():
+                if key == "Items":
+                    break
+                header[key] = reader.value()
+        return header
+
+    @staticmethod
+    def write_items(path, items, make_header):
+        """
+        Stream items into a JSON database, formatted like save_json_file
+
+        The header is written at the top of the file once every item has been
+        seen, so it can hold totals computed while writing.
+
+        Args:
+            path: The path for the JSON database to write
+            items: The (item_id, item_data) pairs to write
+            make_header: Called after the items were written, returns the
+                hash map written before "Items"
+        """
+        with atomic_open(path) as data_file:
+            data_file.write(" " * HEADER_SIZE + '\n    "Items": {')
+            separator = "\n"
+            for item_id, item_data in items:
+                value = json.dumps(item_data, indent=4).replace("\n", "\n        ")
+                data_file.write(f"{separator}        {json.dumps(item_id)}: {value}")
+                separator = ",\n"
+            data_file.write("\n    }\n}" if separator == ",\n" else "}\n}")
+
+            header = "{" + "".join(f"\n    {json.dumps(key)}: {json.dumps(value)}," for key, value in make_header().items())
+            if len(header) > HEADER_SIZE:
+                raise ValueError("The header of the JSON database is too large")
+            # Blanks are valid JSON whitespace, pad the header up to the items
+            data_file.seek(0)
+            data_file.write(header.ljust(HEADER_SIZE))
+
+    @staticmethod
+    def save_json_file(path, data):
+        """
+        Write a hash map to a JSON file
+
+        The data is written to a temporary file next to the target which then
+        replaces it, so readers never see a partially written file.
+
+        Args:
+            path: The path for the JSON file to write
+            data: The hash map to serialize
+        """
+        with atomic_open(path) as data_file:
+            data_file.write(json.dumps(data, indent=4))
+
+    @staticmethod
+    def load_json_lines(path, offset=0) -> tuple[list[dict], int]:
+        """
+        Read a JSON lines file, one record per line
+
+        A truncated last line (e.g. left by a crash or an append in progress)
+        is ignored and not counted in the returned offset.
+
+        Args:
+            path: The path for the JSON lines file to read
+            offset: The byte offset to start reading from
+
+        Returns:
+            tuple[list[dict], int]: The records read, empty if the file does
+                not exist, and the offset right after the last complete one
+        """
+        if not os.path.exists(path):
+            return [], 0
+
+        records = []
+        with open(path, 'rb') as data_file:
+            data_file.seek(offset)
+            for line in data_file:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+                offset += len(line)
+        return records, offset
+
+    @staticmethod
+    def load_last_json_line(path, chunk_size=CHUNK_SIZE) -> dict | None:
+        """
+        Read the last complete record of a JSON lines file, reading the file
+        backward from its end
+
+        Args:
+            path: The path for the JSON lines file to read
+            chunk_size: The number of bytes read from the file at once
+
+        Returns:
+            dict | None: The last record, None if the file does not exist or
+                holds no complete record
+        """
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'rb') as data_file:
+            end = position = data_file.seek(0, os.SEEK_END)
+            while position > 0:
+                position = max(0, position - chunk_size)
+                data_file.seek(position)
+                # Whatever follows the last newline is an append in progress
+                lines = data_file.read(end - position).split(b'\n')[:-1]
+                # The first line may have been cut by the chunk, unless it starts the file
+                if len(lines) >= 2 or (lines and position == 0):
+                    try:
+                        return json.loads(lines[-1])
+                    except json.JSONDecodeError:
+                        return None
+        return None
+
+    @staticmethod
+    def append_json_lines(path, records):
+        """
+        Append records to a JSON lines file with a single write
+
+        Args:
+            path: The path for the JSON lines file to append to
+            records: The records to append
+        """
+        lines = ''.join(json.dumps(record) + '\n' for record in records)
+        with open(path, 'a') as data_file:
+            data_file.write(lines)
 
     @staticmethod
     def print_json_structure(data_file):
-        for id, item in data_file["Items"].items():
+        FStream.print_items(data_file["Items"].items())
+
+    @staticmethod
+    def print_items(items):
+        """
+        Print (item_id, item_data) pairs one by one, they can be streamed
+        """
+        for id, item in items:
             print(id, item)
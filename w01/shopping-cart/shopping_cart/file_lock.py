@@ -0,0 +1,40 @@
+import os
+from dataclasses import dataclass, field
+
+try:
+    import fcntl
+except ImportError:  # Windows, locking is skipped there
+    fcntl = None
+
+@dataclass
+class FileLock:
+    """
+    Advisory lock on a file shared between processes, used as a context manager
+
+    Shared locks can be held by many readers at once, an exclusive lock waits
+    until every other lock is released. Only available where `fcntl` is,
+    elsewhere the lock does nothing.
+    """
+    path: str
+    shared: bool = False
+    _fd: int | None = field(init=False, default=None, repr=False)
+
+    def acquire(self):
+        if fcntl is None:
+            return
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+
+    def release(self):
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -1,17 +1,30 @@
 from dataclasses import dataclass, field
+from decimal import Decimal
 from shopping_cart.random_number_utils import RandomNumberUtils
 
+CENT = Decimal("0.01")
+
+def exact_price(price: float) -> Decimal:
+    """
+    Returns a price rounded like Item.price as an exact decimal amount
+    """
+    return Decimal(repr(round(price, 2))).quantize(CENT)
+
 @dataclass(frozen=True, order=True, slots=True)
 class Item:
     name: str
     type: str
     _price: float = 0.0
-    _id: str = field(default_factory=RandomNumberUtils.generate_random_id)
+    _id: str = field(default_factory=RandomNumberUtils.generate_id)
 
     @property
     def price(self) -> float:
         return round(self._price, 2)
 
+    @property
+    def exact_price(self) -> Decimal:
+        return exact_price(self._price)
+
     @property
     def search_string(self):
         return f"{self.name} {self.type}"
\ No newline at end of file
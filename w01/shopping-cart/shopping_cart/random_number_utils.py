@@ -1,10 +1,48 @@
+import os
 import random
 import string
+import threading
+import time
+
+# Crockford base 32, its characters sort in the same order as their values
+ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+TIME_LENGTH = 10
+NODE_LENGTH = 6
+COUNTER_LENGTH = 4
+COUNTER_LIMIT = len(ID_ALPHABET) ** COUNTER_LENGTH
+# All the 2 character strings, a counter is encoded as two of them
+ID_PAIRS = [high + low for high in ID_ALPHABET for low in ID_ALPHABET]
+
+def encode_base32(value: int, length: int) -> str:
+    """
+    Encode a positive integer in Crockford base 32, left padded to a length
+    """
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, 32)
+        chars.append(ID_ALPHABET[digit])
+    return ''.join(reversed(chars))
 
 class RandomNumberUtils:
     """
     Class for generation of random numbers
+
+    `generate_id` follows `id_format`:
+        "sortable": 20 character ids made of the time in milliseconds, a
+            random per-process node and a counter. They are unique, sort in
+            creation order within a process and roughly by time across them.
+        "random": the legacy 6 uppercase letters, which collide once there
+            are more than a few thousand ids.
     """
+    id_format = "sortable"
+
+    _lock = threading.Lock()
+    _pid = None
+    _node = ""
+    _last_ms = 0
+    _counter = 0
+    _prefix = ""
+
     @staticmethod
     def generate_random_id() -> str:
         """
@@ -12,3 +50,81 @@ class RandomNumberUtils:
         """
         return ''.join(random.choices(string.ascii_uppercase, k=6))
 
+    @classmethod
+    def generate_id(cls) -> str:
+        """
+        Generate an ID in the configured `id_format`
+        """
+        if cls.id_format == "random":
+            return cls.generate_random_id()
+        return cls.generate_sortable_id()
+
+    @classmethod
+    def generate_ids(cls, count: int) -> list[str]:
+        """
+        Generate a batch of IDs in the configured `id_format`
+
+        Args:
+            count (int): The number of IDs to generate
+
+        Returns:
+            list[str]: The IDs, in increasing order for the sortable format
+        """
+        if cls.id_format == "random":
+            return [cls.generate_random_id() for _ in range(count)]
+        return cls.generate_sortable_ids(count)
+
+    @classmethod
+    def _reserve(cls, count: int) -> tuple[str, int, int]:
+        """
+        Reserves up to `count` consecutive counters of the current millisecond,
+        the caller must hold the lock
+
+        Returns:
+            tuple[str, int, int]: The shared prefix of the IDs and the range of counters
+        """
+        if cls._pid != os.getpid():
+            # A new or forked process gets its own node
+            cls._pid = os.getpid()
+            cls._node = encode_base32(random.SystemRandom().getrandbits(5 * NODE_LENGTH), NODE_LENGTH)
+            cls._last_ms = 0
+            cls._counter = 0
+
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > cls._last_ms:
+            cls._last_ms = now_ms
+            cls._counter = 0
+            cls._prefix = encode_base32(now_ms, TIME_LENGTH) + cls._node
+        elif cls._counter >= COUNTER_LIMIT:
+            # Borrow the next millisecond once its counter is exhausted
+            cls._last_ms += 1
+            cls._counter = 0
+            cls._prefix = encode_base32(cls._last_ms, TIME_LENGTH) + cls._node
+
+        start = cls._counter
+        cls._counter = min(start + count, COUNTER_LIMIT)
+        return cls._prefix, start, cls._counter
+
+    @classmethod
+    def generate_sortable_id(cls) -> str:
+        """
+        Generate a monotonic, collision-free ID of length 20 as a string
+        """
+        with cls._lock:
+            prefix, counter, _ = cls._reserve(1)
+        return prefix + ID_PAIRS[counter >> 10] + ID_PAIRS[counter & 1023]
+
+    @classmethod
+    def generate_sortable_ids(cls, count: int) -> list[str]:
+        """
+        Generate a batch of monotonic, collision-free IDs of length 20
+
+        The counters are reserved by blocks, so the prefix shared by the IDs
+        of a millisecond is only encoded once.
+        """
+        ids = []
+        with cls._lock:
+            while len(ids) < count:
+                prefix, start, end = cls._reserve(count - len(ids))
+                ids.extend(prefix + ID_PAIRS[counter >> 10] + ID_PAIRS[counter & 1023] for counter in range(start, end))
+        return ids
@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field
+
+NGRAM_SIZE = 3
+
+def ngrams(text: str) -> set[str]:
+    """
+    Returns the set of trigrams of a lowercase text
+    """
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+@dataclass
+class TrigramIndex:
+    """
+    Inverted trigram index for case insensitive substring search
+
+    Every indexed text is split in overlapping 3 character chunks and each
+    chunk maps to the ids of the texts containing it. A query only has to be
+    checked against the ids sharing all of its trigrams.
+    """
+    _postings: dict = field(default_factory=dict, repr=False)
+    _texts: dict = field(default_factory=dict, repr=False)
+    _positions: dict = field(default_factory=dict, repr=False)
+    _next_position: int = field(default=0, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, item_id: str, text: str):
+        """
+        Indexes a text, replacing the previous one with the same id
+
+        Args:
+            item_id (str): The id of the indexed item
+            text (str): The text to index
+        """
+        text = text.lower()
+        previous = self._texts.get(item_id)
+        if previous == text:
+            return
+        if previous is not None:
+            self._unlink(item_id, previous)
+        else:
+            # Remember the insertion order to return hits like a dict scan
+            self._positions[item_id] = self._next_position
+            self._next_position += 1
+
+        self._texts[item_id] = text
+        for gram in ngrams(text):
+            self._postings.setdefault(gram, set()).add(item_id)
+
+    def remove(self, item_id: str):
+        """
+        Removes a text from the index, if present
+
+        Args:
+            item_id (str): The id of the indexed item
+        """
+        text = self._texts.pop(item_id, None)
+        if text is None:
+            return
+        self._unlink(item_id, text)
+        del self._positions[item_id]
+
+    def _unlink(self, item_id: str, text: str):
+        for gram in ngrams(text):
+            posting = self._postings[gram]
+            posting.discard(item_id)
+            if not posting:
+                del self._postings[gram]
+
+    def clear(self):
+        """
+        Removes every text from the index
+        """
+        self._postings.clear()
+        self._texts.clear()
+        self._positions.clear()
+        self._next_position = 0
+
+    def candidates(self, query: str):
+        """
+        Returns the ids that may contain the query
+
+        Args:
+            query (str): The lowercase query
+
+        Returns:
+            The candidate ids, or every indexed id for queries too short to index
+        """
+        grams = ngrams(query)
+        if not grams:
+            return self._texts.keys()
+
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def search(self, query: str) -> list[str]:
+        """
+        Returns the ids of the texts containing the query, ignoring case,
+        in insertion order
+
+        Args:
+            query (str): The query to search for
+        """
+        query = query.lower()
+        hits = [item_id for item_id in self.candidates(query) if query in self._texts[item_id]]
+        hits.sort(key=self._positions.__getitem__)
+        return hits
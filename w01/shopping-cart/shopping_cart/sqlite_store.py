@@ -0,0 +1,214 @@
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from shopping_cart.item import CENT
+from shopping_cart.store import ItemStore, JsonItemStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_type ON items (type COLLATE NOCASE);
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5 (
+    name, type, content='items', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, name, type) VALUES (new.rowid, new.name, new.type);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, type) VALUES ('delete', old.rowid, old.name, old.type);
+END;
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, type) VALUES ('delete', old.rowid, old.name, old.type);
+    INSERT INTO items_fts (rowid, name, type) VALUES (new.rowid, new.name, new.type);
+END;
+"""
+
+# The statements are kept constant so sqlite3 reuses its prepared statements
+UPSERT_ITEM = """
+INSERT INTO items (id, name, type, price) VALUES (?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET name = excluded.name, type = excluded.type, price = excluded.price
+"""
+SELECT_ITEMS = "SELECT id, name, type, price FROM items"
+SELECT_ITEMS_BY_ID = "SELECT id, name, type, price FROM items WHERE id = ?"
+SELECT_ITEMS_BY_TEXT = """
+SELECT items.id, items.name, items.type, items.price FROM items_fts
+JOIN items ON items.rowid = items_fts.rowid WHERE items_fts MATCH ?
+"""
+SELECT_ITEMS_BY_TYPE = "SELECT id, name, type, price FROM items WHERE type = ? COLLATE NOCASE ORDER BY rowid"
+DELETE_ITEM = "DELETE FROM items WHERE id = ?"
+DELETE_ITEMS = "DELETE FROM items"
+COUNT_ITEMS = "SELECT COUNT(*) FROM items"
+# Prices are summed as whole cents to stay exact
+SUM_CENTS = "SELECT COALESCE(SUM(CAST(ROUND(price * 100) AS INTEGER)), 0) FROM items"
+
+# The trigram tokenizer can only match queries of at least 3 characters
+MIN_FTS_QUERY = 3
+
+@dataclass
+class SqliteItemStore(ItemStore):
+    """
+    SQLite storage backend for the Cart
+
+    Items live in an `items` table indexed on type for get_items_by_type, with
+    an FTS5 trigram index used for the substring searches. Counts and totals are
+    computed by aggregate queries, prices being summed as exact cents. Changes are committed following the same
+    `flush_interval` rules as the JSON store.
+    """
+    path: str
+    flush_interval: float | None = 0.0
+    connection: sqlite3.Connection = field(init=False, repr=False)
+    dirty: bool = field(init=False, default=False)
+    _last_flush: float = field(init=False, default=0.0, repr=False)
+
+    def __post_init__(self):
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def _to_pair(row) -> tuple[str, dict]:
+        item_id, name, type, price = row
+        return item_id, {"name": name, "type": type, "price": price}
+
+    @property
+    def items(self) -> dict:
+        """
+        dict: The hash map of items, keyed by item id
+        """
+        return dict(self._to_pair(row) for row in self.connection.execute(SELECT_ITEMS))
+
+    def get_items_by_type(self, type: str) -> list[tuple[str, dict]]:
+        """
+        Returns the items of a given type, ignoring case, through the type index
+        """
+        return [self._to_pair(row) for row in self.connection.execute(SELECT_ITEMS_BY_TYPE, (type,))]
+
+    def add(self, item_id: str, item_data: dict):
+        """
+        Adds or replaces an item
+
+        Args:
+            item_id (str): The id of the item
+            item_data (dict): The name, type and price of the item
+        """
+        self.add_many([(item_id, item_data)])
+
+    def add_many(self, items):
+        """
+        Adds or replaces several items in one statement
+
+        Args:
+            items: The (item_id, item_data) pairs to add
+        """
+        self.connection.executemany(
+            UPSERT_ITEM,
+            ((item_id, item_data["name"], item_data["type"], item_data["price"]) for item_id, item_data in items),
+        )
+        self._mark_dirty()
+
+    def remove_many(self, item_ids) -> list[dict]:
+        """
+        Removes several items with a single change to the database
+
+        Args:
+            item_ids: The ids of the items to remove
+
+        Returns:
+            list[dict]: The data of the removed items
+        """
+        removed = []
+        for item_id in item_ids:
+            row = self.connection.execute(SELECT_ITEMS_BY_ID, (item_id,)).fetchone()
+            if row is None:
+                raise KeyError(item_id)
+            removed.append(self._to_pair(row)[1])
+        self.connection.executemany(DELETE_ITEM, ((item_id,) for item_id in item_ids))
+        if removed:
+            self._mark_dirty()
+        return removed
+
+    def clear(self):
+        """
+        Removes all the items
+        """
+        self.connection.execute(DELETE_ITEMS)
+        self._mark_dirty()
+
+    def _candidates(self, query: str):
+        """
+        Returns the rows that may contain the query in their name or type
+        """
+        if len(query) < MIN_FTS_QUERY:
+            return self.connection.execute(SELECT_ITEMS)
+        phrase = '"' + query.replace('"', '""') + '"'
+        return self.connection.execute(SELECT_ITEMS_BY_TEXT, (phrase,))
+
+    def search(self, query: str) -> list[tuple[str, dict]]:
+        # A query without spaces can only match inside the name or the type,
+        # anything else may span both and needs a full scan
+        if " " in query:
+            return super().search(query)
+        query = query.lower()
+        return [
+            self._to_pair(row) for row in self._candidates(query)
+            if query in row[1].lower() or query in row[2].lower()
+        ]
+
+    def match(self, query: str) -> list[str]:
+        query = query.lower()
+        return [
+            row[0] for row in self._candidates(query)
+            if query in row[1].lower() or query in row[2].lower()
+        ]
+
+    def count(self) -> int:
+        return self.connection.execute(COUNT_ITEMS).fetchone()[0]
+
+    def total_price(self) -> Decimal:
+        cents = self.connection.execute(SUM_CENTS).fetchone()[0]
+        return (Decimal(cents) / 100).quantize(CENT)
+
+    def import_json(self, json_path: str):
+        """
+        Imports the items of a JSON database, replacing the current ones
+
+        The database is read through JsonItemStore, so the changes of its
+        journal are imported too.
+
+        Args:
+            json_path (str): The path of the JSON database to import
+        """
+        items = JsonItemStore(json_path).iter_items()
+        self.connection.execute(DELETE_ITEMS)
+        self.add_many(items)
+
+    def _mark_dirty(self):
+        self.dirty = True
+        if self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        else:
+            self._track_pending(True)
+
+    def flush(self):
+        """
+        Commits the pending changes
+        """
+        if not self.dirty:
+            return
+        self.connection.commit()
+        self._track_pending(False)
+        self.dirty = False
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """
+        Commits the pending changes and closes the connection
+        """
+        self.flush()
+        self.connection.close()
@@ -0,0 +1,690 @@
+import atexit
+import os
+import time
+import warnings
+from dataclasses import dataclass, field
+from decimal import Decimal
+from shopping_cart.columns import ItemColumns
+from shopping_cart.file_io import CHUNK_SIZE, FStream
+from shopping_cart.file_lock import FileLock
+from shopping_cart.item import Item, exact_price
+from shopping_cart.search_index import TrigramIndex
+
+# Stores with changes not written yet, keyed by id() since the dataclasses aren't hashable.
+# The references are strong so a dirty store dropped by its owner still gets flushed.
+_UNFLUSHED = {}
+
+@atexit.register
+def _flush_at_exit():
+    """
+    Writes the changes still pending when the interpreter exits
+    """
+    for store in list(_UNFLUSHED.values()):
+        try:
+            store.flush()
+        except Exception as e:
+            warnings.warn(f"Could not flush the changes of {store!r} on exit: {e}")
+
+def search_string(item_id: str, item_data: dict) -> str:
+    """
+    Returns the text searched by the queries for an item
+    """
+    return Item(name=item_data["name"], type=item_data["type"], _id=item_id).search_string
+
+def sum_prices(item_datas) -> Decimal:
+    """
+    Returns the exact sum of the prices of an iterable of item data
+    """
+    return sum((exact_price(item_data["price"]) for item_data in item_datas), Decimal("0.00"))
+
+class ItemStore:
+    """
+    Base class of the storage backends used by the Cart
+
+    Items are exchanged as `(item_id, {"name", "type", "price"})` pairs.
+    Backends must implement `items`, `add`, `remove_many` and `clear`; the
+    queries below fall back to a linear scan over iter_items() and can be
+    overridden with faster backend specific versions.
+    """
+
+    @property
+    def items(self) -> dict:
+        """
+        dict: The hash map of items, keyed by item id
+        """
+        raise NotImplementedError
+
+    def iter_items(self):
+        """
+        Iterates over the (item_id, item_data) pairs
+        """
+        return iter(self.items.items())
+
+    def as_dict(self) -> dict:
+        """
+        Returns the database as a hash map in the JSON file layout
+        """
+        return {"Items": self.items}
+
+    def add(self, item_id: str, item_data: dict):
+        raise NotImplementedError
+
+    def add_many(self, items):
+        """
+        Adds or replaces several items
+
+        Args:
+            items: The (item_id, item_data) pairs to add
+        """
+        for item_id, item_data in items:
+            self.add(item_id, item_data)
+
+    def remove(self, item_id: str) -> dict:
+        """
+        Removes an item
+
+        Args:
+            item_id (str): The id of the item to remove
+
+        Returns:
+            dict: The data of the removed item
+        """
+        return self.remove_many([item_id])[0]
+
+    def remove_many(self, item_ids) -> list[dict]:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def columns(self) -> ItemColumns:
+        """
+        Returns a columnar snapshot of the items for scan heavy queries
+        """
+        return ItemColumns.from_items(self.iter_items())
+
+    def get_items_by_type(self, type: str) -> list[tuple[str, dict]]:
+        """
+        Returns the (item_id, item_data) pairs of a given type, ignoring case, in insertion order
+        """
+        columns = self.columns()
+        return list(columns.items(columns.indices_of_type(type)))
+
+    def search(self, query: str) -> list[tuple[str, dict]]:
+        """
+        Returns the items whose search string contains the query, ignoring case
+        """
+        query = query.lower()
+        return [
+            (item_id, item_data) for item_id, item_data in self.iter_items()
+            if query in search_string(item_id, item_data).lower()
+        ]
+
+    def match(self, query: str) -> list[str]:
+        """
+        Returns the ids of the items whose name or type contains the query, ignoring case
+        """
+        query = query.lower()
+        return [
+            item_id for item_id, item_data in self.iter_items()
+            if query in item_data["name"].lower() or query in item_data["type"].lower()
+        ]
+
+    def count(self) -> int:
+        """
+        Returns the number of items
+        """
+        return sum(1 for _ in self.iter_items())
+
+    def total_price(self) -> Decimal:
+        """
+        Returns the exact sum of the prices of the items
+        """
+        return sum_prices(item_data for _, item_data in self.iter_items())
+
+    def verify_totals(self):
+        """
+        Recomputes the count and total price from the items and checks them
+        against the ones reported by the store
+
+        Raises:
+            ValueError: If the totals are not consistent with the items
+        """
+        count = 0
+        total = Decimal("0.00")
+        for _, item_data in self.iter_items():
+            count += 1
+            total += exact_price(item_data["price"])
+        if (self.count(), self.total_price()) != (count, total):
+            raise ValueError(
+                f"Inconsistent totals: store reports {self.count()} items for {self.total_price()}, "
+                f"items add up to {count} items for {total}"
+            )
+
+    def refresh(self):
+        """
+        Picks up changes made to the database by someone else
+        """
+
+    def flush(self):
+        """
+        Writes the pending changes to the database
+        """
+
+    def _track_pending(self, pending: bool):
+        """
+        Registers or unregisters the store for the flush at interpreter exit
+        """
+        if pending:
+            _UNFLUSHED[id(self)] = self
+        else:
+            _UNFLUSHED.pop(id(self), None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+@dataclass
+class JsonItemStore(ItemStore):
+    """
+    In-memory, write-back cache of a JSON items database
+
+    The database is loaded once and kept in memory. Changes are only written
+    back to disk on flush(), when leaving a `with` block, or by the next
+    change made once `flush_interval` seconds have passed since the last
+    flush: there is no timer, so the last changes of a burst wait for one of
+    the others. Whatever is still pending is flushed when the interpreter exits.
+
+    In journal mode each change is appended as one JSON line to
+    `<path>.journal` instead of rewriting the whole database. The journal is
+    replayed on load and compacted into the database once it grows past
+    `compact_threshold` bytes.
+
+    Several processes can share the same database. Reads hold a shared lock on
+    `<path>.lock` and writes an exclusive one for the duration of the commit.
+    Every commit bumps the database `version`; a writer that finds the files
+    changed since its last read, or a newer version committed, reloads them
+    and replays its pending changes on top, so concurrent updates are not lost.
+
+    Searches go through a trigram index built on the first query and kept in
+    sync with every change afterwards. The item count and total price are
+    maintained on every change and saved in the database next to the items,
+    so they never require a full scan.
+    """
+    path: str
+    flush_interval: float | None = 0.0
+    journal: bool = False
+    compact_threshold: int = 1024 * 1024
+    data: dict = field(init=False, repr=False)
+    dirty: bool = field(init=False, default=False)
+    _pending: list = field(init=False, default_factory=list, repr=False)
+    _signature: tuple | None = field(init=False, default=None, repr=False)
+    _last_flush: float = field(init=False, default=0.0, repr=False)
+    _index: TrigramIndex | None = field(init=False, default=None, repr=False)
+    _columns: ItemColumns | None = field(init=False, default=None, repr=False)
+    _count: int = field(init=False, default=0, repr=False)
+    _total: Decimal = field(init=False, default=Decimal("0.00"), repr=False)
+    version: int = field(init=False, default=0)
+    _journal_offset: int = field(init=False, default=0, repr=False)
+
+    def __post_init__(self):
+        self.load()
+
+    @property
+    def journal_path(self) -> str:
+        return f"{self.path}.journal"
+
+    @property
+    def lock_path(self) -> str:
+        return f"{self.path}.lock"
+
+    @staticmethod
+    def _stat_file(path) -> tuple | None:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _stat(self) -> tuple:
+        """
+        Returns the (inode, mtime, size) signatures of the database and its journal
+        """
+        return (self._stat_file(self.path), self._stat_file(self.journal_path))
+
+    def load(self):
+        """
+        (Re)loads the database from disk, dropping any unsaved change
+        """
+        with FileLock(self.lock_path, shared=True):
+            self._read()
+
+    def _read(self):
+        """
+        Loads the database, the caller must hold the lock
+        """
+        if os.path.exists(self.path):
+            data = FStream.load_json_file(self.path)
+        else:
+            data = {"Items": {}}
+
+        # Convert Items from list to dict if needed (for backward compatibility)
+        if not isinstance(data.get("Items"), dict):
+            data["Items"] = {}
+
+        totals = data.pop("Totals", None)
+        self.version = data.pop("Version", 0)
+        self.data = data
+        self._index = None
+        self._columns = None
+        if isinstance(totals, dict) and totals.get("count") == len(data["Items"]):
+            self._count = totals["count"]
+            self._total = Decimal(totals["price"])
+        else:
+            # Databases written before the totals were saved need one scan
+            self._count = len(data["Items"])
+            self._total = sum_prices(data["Items"].values())
+        self._journal_offset = 0
+        self._read_journal()
+        self._mark_clean()
+
+    def _read_journal(self):
+        """
+        Applies the journal entries appended since the last read
+        """
+        entries, self._journal_offset = FStream.load_json_lines(self.journal_path, self._journal_offset)
+        for entry in entries:
+            self._apply(entry)
+            self.version = entry.get("v", self.version)
+
+    def _committed_version(self) -> int:
+        """
+        Returns the version of the last commit on disk: the "v" of the last
+        journal entry, or the Version in the header of the database
+        """
+        last_entry = FStream.load_last_json_line(self.journal_path)
+        if last_entry is not None and "v" in last_entry:
+            return last_entry["v"]
+        if os.path.exists(self.path):
+            return FStream.load_json_header(self.path).get("Version", 0)
+        return 0
+
+    def _sync(self):
+        """
+        Catches up with the changes committed by other processes. When only
+        the journal grew, just the new entries are read. The caller must hold
+        a lock.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return
+        database, journal = signature
+        _, old_journal = self._signature
+        grew = (
+            journal is not None and old_journal is not None
+            and journal[0] == old_journal[0] and journal[2] >= self._journal_offset
+        )
+        if database == self._signature[0] and grew:
+            self._read_journal()
+            self._signature = signature
+        else:
+            self._read()
+
+    def refresh(self):
+        """
+        Reloads the database if the file changed on disk since it was last
+        read or written. Pending changes are kept and will overwrite the file.
+        """
+        if not self.dirty and self._stat() != self._signature:
+            with FileLock(self.lock_path, shared=True):
+                self._sync()
+
+    @property
+    def items(self) -> dict:
+        """
+        dict: The up-to-date hash map of items, keyed by item id
+        """
+        self.refresh()
+        return self.data["Items"]
+
+    def as_dict(self) -> dict:
+        """
+        Returns a copy of the database, editing it leaves the store untouched
+        """
+        self.refresh()
+        items = {item_id: dict(item_data) for item_id, item_data in self.data["Items"].items()}
+        return {**self.data, "Items": items}
+
+    def _apply(self, entry: dict):
+        """
+        Applies a journal entry to the in-memory data
+        """
+        self._columns = None
+        if entry["op"] == "add":
+            previous = self.data["Items"].get(entry["id"])
+            if previous is not None:
+                self._count -= 1
+                self._total -= exact_price(previous["price"])
+            self.data["Items"][entry["id"]] = entry["item"]
+            self._count += 1
+            self._total += exact_price(entry["item"]["price"])
+            if self._index is not None:
+                self._index.add(entry["id"], search_string(entry["id"], entry["item"]))
+        elif entry["op"] == "remove":
+            previous = self.data["Items"].pop(entry["id"], None)
+            if previous is not None:
+                self._count -= 1
+                self._total -= exact_price(previous["price"])
+            if self._index is not None:
+                self._index.remove(entry["id"])
+        elif entry["op"] == "clear":
+            self.data["Items"] = {}
+            self._count = 0
+            self._total = Decimal("0.00")
+            if self._index is not None:
+                self._index.clear()
+        else:
+            raise ValueError(f"Unknown journal operation '{entry['op']}'")
+
+    @property
+    def index(self) -> TrigramIndex:
+        """
+        TrigramIndex: The search index of the items, built on first use
+        """
+        items = self.items
+        if self._index is None:
+            self._index = TrigramIndex()
+            for item_id, item_data in items.items():
+                self._index.add(item_id, search_string(item_id, item_data))
+        return self._index
+
+    def columns(self) -> ItemColumns:
+        # Rebuilt on the first call after a change
+        items = self.items
+        if self._columns is None:
+            self._columns = ItemColumns.from_items(items.items())
+        return self._columns
+
+    def count(self) -> int:
+        self.refresh()
+        return self._count
+
+    def total_price(self) -> Decimal:
+        self.refresh()
+        return self._total
+
+    def search(self, query: str) -> list[tuple[str, dict]]:
+        items = self.items
+        return [(item_id, items[item_id]) for item_id in self.index.search(query)]
+
+    def match(self, query: str) -> list[str]:
+        # Name and type are both part of the search string, so its hits are
+        # a superset of the name or type matches
+        query = query.lower()
+        return [
+            item_id for item_id, item_data in self.search(query)
+            if query in item_data["name"].lower() or query in item_data["type"].lower()
+        ]
+
+    def _record(self, entries: list[dict]):
+        """
+        Applies new changes and schedules them for the next flush
+        """
+        self.refresh()
+        for entry in entries:
+            self._apply(entry)
+        self._pending.extend(entries)
+        self._mark_dirty()
+
+    def add(self, item_id: str, item_data: dict):
+        """
+        Adds or replaces an item
+
+        Args:
+            item_id (str): The id of the item
+            item_data (dict): The name, type and price of the item
+        """
+        self._record([{"op": "add", "id": item_id, "item": item_data}])
+
+    def add_many(self, items):
+        """
+        Adds or replaces several items with a single change to the database
+
+        Args:
+            items: The (item_id, item_data) pairs to add
+        """
+        entries = [{"op": "add", "id": item_id, "item": item_data} for item_id, item_data in items]
+        if entries:
+            self._record(entries)
+
+    def remove_many(self, item_ids) -> list[dict]:
+        """
+        Removes several items with a single change to the database
+
+        Args:
+            item_ids: The ids of the items to remove
+
+        Returns:
+            list[dict]: The data of the removed items
+        """
+        items = self.items
+        removed = [items[item_id] for item_id in item_ids]
+        if removed:
+            self._record([{"op": "remove", "id": item_id} for item_id in item_ids])
+        return removed
+
+    def clear(self):
+        """
+        Removes all the items
+        """
+        self._record([{"op": "clear"}])
+
+    def _mark_dirty(self):
+        self.dirty = True
+        if self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        else:
+            self._track_pending(True)
+
+    def flush(self):
+        """
+        Writes the pending changes to disk
+        """
+        if not self.dirty:
+            return
+
+        with FileLock(self.lock_path):
+            self._rebase()
+            self.version += 1
+            if self.journal:
+                FStream.append_json_lines(self.journal_path, [{**entry, "v": self.version} for entry in self._pending])
+                # Our own entries are already applied, the next sync starts after them
+                self._journal_offset = os.path.getsize(self.journal_path)
+                if self._journal_offset > self.compact_threshold:
+                    self._write_snapshot()
+            else:
+                self._write_snapshot()
+
+            self._mark_clean()
+
+    def _rebase(self):
+        """
+        Replays the pending changes over the latest version of the database
+        if another process committed since it was read. The caller must hold
+        the exclusive lock.
+
+        A commit is detected from the file signatures, or from the committed
+        version when a replaced file kept the same inode, size and mtime.
+        """
+        pending = self._pending
+        if self._stat() != self._signature:
+            self._sync()
+        elif self._committed_version() != self.version:
+            self._read()
+        else:
+            return
+        for entry in pending:
+            self._apply(entry)
+        self._pending = pending
+        self.dirty = bool(pending)
+
+    def _mark_clean(self):
+        self._track_pending(False)
+        self.dirty = False
+        self._pending = []
+        self._signature = self._stat()
+        self._last_flush = time.monotonic()
+
+    def _write_snapshot(self):
+        totals = {"count": self._count, "price": str(self._total)}
+        FStream.save_json_file(self.path, {"Version": self.version, "Totals": totals, **self.data})
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_offset = 0
+
+    def compact(self):
+        """
+        Folds the journal and any pending change into the database file
+        """
+        with FileLock(self.lock_path):
+            self._rebase()
+            self.version += 1
+            self._write_snapshot()
+            self._mark_clean()
+
+@dataclass
+class StreamingJsonItemStore(ItemStore):
+    """
+    JSON storage backend for databases too large to be kept in memory
+
+    Nothing is cached: reads stream the items from disk one by one, and every
+    change streams the database into a new file. Count and total price are
+    read from the header of the file when present. Journals are not
+    supported, compact them with JsonItemStore first.
+    """
+    path: str
+    chunk_size: int = CHUNK_SIZE
+
+    def __post_init__(self):
+        if os.path.exists(f"{self.path}.journal"):
+            raise ValueError(f"'{self.path}' has a pending journal, compact it before streaming the database")
+        if not os.path.exists(self.path):
+            self.clear()
+
+    @property
+    def lock_path(self) -> str:
+        return f"{self.path}.lock"
+
+    @property
+    def items(self) -> dict:
+        """
+        dict: The hash map of items, keyed by item id, read in full
+        """
+        return dict(self.iter_items())
+
+    def iter_items(self):
+        return FStream.iter_items(self.path, self.chunk_size)
+
+    @property
+    def version(self) -> int:
+        return FStream.load_json_header(self.path, self.chunk_size).get("Version", 0)
+
+    def count(self) -> int:
+        totals = FStream.load_json_header(self.path, self.chunk_size).get("Totals")
+        return totals["count"] if totals else super().count()
+
+    def total_price(self) -> Decimal:
+        totals = FStream.load_json_header(self.path, self.chunk_size).get("Totals")
+        return Decimal(totals["price"]) if totals else super().total_price()
+
+    def _rewrite(self, items):
+        """
+        Streams the given items into the database, with updated totals and
+        version. The caller must hold the exclusive lock.
+        """
+        version = self.version + 1 if os.path.exists(self.path) else 1
+        count = 0
+        total = Decimal("0.00")
+
+        def counted():
+            nonlocal count, total
+            for item_id, item_data in items:
+                count += 1
+                total += exact_price(item_data["price"])
+                yield item_id, item_data
+
+        FStream.write_items(
+            self.path, counted(),
+            lambda: {"Version": version, "Totals": {"count": count, "price": str(total)}},
+        )
+
+    def add(self, item_id: str, item_data: dict):
+        """
+        Adds or replaces an item
+
+        Args:
+            item_id (str): The id of the item
+            item_data (dict): The name, type and price of the item
+        """
+        self.add_many([(item_id, item_data)])
+
+    def add_many(self, items):
+        """
+        Adds or replaces several items in a single pass over the database
+
+        Args:
+            items: The (item_id, item_data) pairs to add
+        """
+        new_items = dict(items)
+        if not new_items:
+            return
+
+        def merged():
+            for item_id, item_data in self.iter_items():
+                yield item_id, new_items.pop(item_id, item_data)
+            yield from new_items.items()
+
+        with FileLock(self.lock_path):
+            self._rewrite(merged())
+
+    def remove_many(self, item_ids) -> list[dict]:
+        """
+        Removes several items in a single pass over the database
+
+        Args:
+            item_ids: The ids of the items to remove
+
+        Returns:
+            list[dict]: The data of the removed items
+
+        Raises:
+            KeyError: If one of the ids is not in the database, nothing is removed then
+        """
+        item_ids = list(item_ids)
+        wanted = set(item_ids)
+        removed = {}
+
+        def remaining():
+            for item_id, item_data in self.iter_items():
+                if item_id in wanted:
+                    removed[item_id] = item_data
+                else:
+                    yield item_id, item_data
+            # Raising here discards the new file before it replaces the database
+            for item_id in item_ids:
+                if item_id not in removed:
+                    raise KeyError(item_id)
+
+        if wanted:
+            with FileLock(self.lock_path):
+                self._rewrite(remaining())
+        return [removed[item_id] for item_id in item_ids]
+
+    def clear(self):
+        """
+        Removes all the items
+        """
+        with FileLock(self.lock_path):
+            self._rewrite([])
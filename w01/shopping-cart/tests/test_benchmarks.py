@@ -0,0 +1,9 @@
+from benchmarks.run_benchmarks import compare, run
+
+def test_run_and_compare():
+    report = run(["json", "sqlite"], [50], repeat=1)
+    assert set(report["results"]) >= {"json/add/50", "sqlite/empty/50"}
+    assert compare(report, report, threshold=0.2) == []
+
+    slower = {"results": {name: {"median_s": timing["median_s"] * 2} for name, timing in report["results"].items()}}
+    assert len(compare(slower, report, threshold=0.2)) == len(report["results"])
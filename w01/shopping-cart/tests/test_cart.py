@@ -1,11 +1,12 @@
 import pytest
 from shopping_cart.cart import Cart
 from shopping_cart.item import Item
+from shopping_cart.file_io import FStream
 
 @pytest.fixture
 def cart():
     database= "./tests/test_database.json"
-    cart = Cart(database_path=database)
+    cart = Cart(database_path=database, verify=True)
     cart.empty_cart()
     return cart
 
@@ -49,3 +50,40 @@ def test_get_total_item_count(cart):
     cart.add_item_to_cart(item2)
     assert cart.get_total_item_count() == 2
     
+
+def test_add_items_writes_once(cart, monkeypatch):
+    writes = []
+    save_json_file = FStream.save_json_file
+
+    def counting_save_json_file(path, data):
+        writes.append(path)
+        save_json_file(path, data)
+
+    monkeypatch.setattr(FStream, "save_json_file", counting_save_json_file)
+    items = [Item(name=f"Apple {i}", type="Fruit", _price=1.0) for i in range(100)]
+    assert cart.add_items(items) == 100
+    assert len(writes) == 1
+    assert cart.get_total_item_count() == 100
+
+def test_remove_items(cart):
+    items = [Item(name=f"Apple {i}", type="Fruit", _price=1.0) for i in range(10)]
+    cart.add_items(items)
+    assert cart.remove_items(item._id for item in items[:4]) == 4
+    assert cart.get_total_item_count() == 6
+    with pytest.raises(KeyError):
+        cart.remove_items([items[0]._id])
+
+def test_total_price_is_exact(cart):
+    cart.add_items([Item(name="Apple", type="Fruit", _price=0.1), Item(name="Pear", type="Fruit", _price=0.2)])
+    assert cart.get_total_price_of_items() == 0.3
+
+def test_get_items_by_type_and_sorted(cart):
+    cart.add_items([
+        Item(name="Milk", type="Drink", _price=3.0),
+        Item(name="Apple", type="Fruit", _price=1.0),
+        Item(name="Pear", type="Fruit", _price=2.0),
+    ])
+    assert [item.name for item in cart.get_items_by_type("fruit")] == ["Apple", "Pear"]
+    assert [item.name for item in cart.get_sorted_items()] == ["Apple", "Pear", "Milk"]
+    cart.remove_item_from_cart("Pear")
+    assert [item.name for item in cart.get_sorted_items("name", reverse=True)] == ["Milk", "Apple"]
@@ -0,0 +1,36 @@
+import pytest
+from shopping_cart import columns as columns_module
+from shopping_cart.columns import ItemColumns
+
+ITEMS = [
+    ("A", {"name": "Apple", "type": "Fruit", "price": 1.1}),
+    ("B", {"name": "Milk", "type": "Drink", "price": 0.2}),
+    ("C", {"name": "Banana", "type": "fruit", "price": 1.1}),
+    ("D", {"name": "Onion", "type": "Vegetable", "price": 0.05}),
+]
+
+@pytest.fixture(params=["numpy", "python"])
+def columns(request, monkeypatch):
+    if request.param == "numpy" and columns_module.np is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == "python":
+        monkeypatch.setattr(columns_module, "np", None)
+    return ItemColumns.from_items(ITEMS)
+
+def test_round_trip(columns):
+    assert columns.items() == ITEMS
+    assert columns.types == ["Fruit", "Drink", "fruit", "Vegetable"]
+
+def test_total_price(columns):
+    assert str(columns.total_price()) == "2.45"
+
+def test_indices_of_type(columns):
+    assert columns.indices_of_type("FRUIT") == [0, 2]
+    assert columns.indices_of_type("Dairy") == []
+
+def test_sorted_indices(columns):
+    assert columns.sorted_indices() == [3, 1, 0, 2]
+    assert columns.sorted_indices(reverse=True) == [0, 2, 1, 3]
+    assert columns.sorted_indices("name") == [0, 2, 1, 3]
+    with pytest.raises(ValueError):
+        columns.sorted_indices("weight")
@@ -0,0 +1,24 @@
+import pytest
+from benchmarks.bench_concurrency import run
+from shopping_cart.cart import Cart
+from shopping_cart.file_lock import fcntl
+
+pytestmark = pytest.mark.skipif(fcntl is None, reason="file locking needs fcntl")
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_no_lost_writes(tmp_path, journal):
+    database = str(tmp_path / "database.json")
+    run(database, workers=4, count=25, journal=journal)
+    cart = Cart(database_path=database, verify=True)
+    assert cart.get_total_item_count() == 100
+    cart.store.verify_totals()
+
+def test_writer_rebases_on_other_commits(tmp_path):
+    database = str(tmp_path / "database.json")
+    first = Cart(database_path=database, flush_interval=None)
+    second = Cart(database_path=database)
+    first.store.add("AAAAAA", {"name": "Apple", "type": "Fruit", "price": 1.0})
+    second.store.add("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0})
+    first.flush()
+    assert sorted(Cart(database_path=database).get_all_items()["Items"]) == ["AAAAAA", "BBBBBB"]
+    assert first.store.version == 2
@@ -0,0 +1,37 @@
+import json
+import pytest
+from shopping_cart.file_io import FStream
+
+ITEMS = {f"ITEM{i:02d}": {"name": f"Name {i}", "type": "Fruit", "price": i * 1.25} for i in range(20)}
+HEADER = {"Version": 3, "Totals": {"count": 20, "price": "237.50"}}
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "database.json")
+    FStream.write_items(path, iter(ITEMS.items()), lambda: HEADER)
+    return path
+
+def test_write_items_is_valid_json(database):
+    assert FStream.load_json_file(database) == {**HEADER, "Items": ITEMS}
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1024])
+def test_iter_items(database, chunk_size):
+    assert list(FStream.iter_items(database, chunk_size)) == list(ITEMS.items())
+    assert FStream.load_json_header(database, chunk_size) == HEADER
+
+def test_iter_items_of_json_dump(tmp_path):
+    path = tmp_path / "database.json"
+    path.write_text(json.dumps({"Items": ITEMS, "Version": 12}, indent=4))
+    assert dict(FStream.iter_items(str(path), 5)) == ITEMS
+    path.write_text(json.dumps({"Items": []}))
+    assert list(FStream.iter_items(str(path), 5)) == []
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1024])
+def test_load_last_json_line(tmp_path, chunk_size):
+    path = str(tmp_path / "database.json.journal")
+    assert FStream.load_last_json_line(path, chunk_size) is None
+    FStream.append_json_lines(path, [{"op": "add", "v": v} for v in range(1, 6)])
+    assert FStream.load_last_json_line(path, chunk_size) == {"op": "add", "v": 5}
+    with open(path, 'a') as journal_file:
+        journal_file.write('{"op": "remove", "v"')
+    assert FStream.load_last_json_line(path, chunk_size) == {"op": "add", "v": 5}
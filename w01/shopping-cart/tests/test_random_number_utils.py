@@ -0,0 +1,17 @@
+import string
+from shopping_cart.item import Item
+from shopping_cart.random_number_utils import COUNTER_LIMIT, RandomNumberUtils
+
+def test_sortable_ids_are_unique_and_ordered():
+    ids = [RandomNumberUtils.generate_id() for _ in range(1000)]
+    ids += RandomNumberUtils.generate_ids(COUNTER_LIMIT + 10)
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+    assert {len(item_id) for item_id in ids} == {20}
+
+def test_random_id_format(monkeypatch):
+    monkeypatch.setattr(RandomNumberUtils, "id_format", "random")
+    item_id = Item("Apple", "Fruit")._id
+    assert len(item_id) == 6
+    assert set(item_id) <= set(string.ascii_uppercase)
+    assert len(RandomNumberUtils.generate_ids(3)) == 3
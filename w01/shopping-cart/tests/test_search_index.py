@@ -0,0 +1,34 @@
+from shopping_cart.search_index import TrigramIndex
+from shopping_cart.store import JsonItemStore
+
+def test_index_search():
+    index = TrigramIndex()
+    index.add("A", "Pineapple Fruit")
+    index.add("B", "Apple Fruit")
+    index.add("C", "Onion Vegetable")
+    assert index.search("APPLE") == ["A", "B"]
+    assert index.search("e f") == ["A", "B"]
+    assert index.search("on") == ["C"]
+    assert index.search("banana") == []
+
+def test_index_update_and_remove():
+    index = TrigramIndex()
+    index.add("A", "Apple Fruit")
+    index.add("B", "Apple Fruit")
+    index.add("A", "Onion Vegetable")
+    assert index.search("apple") == ["B"]
+    assert index.search("onion") == ["A"]
+    index.remove("A")
+    assert index.search("onion") == []
+    assert len(index) == 1
+
+def test_store_keeps_index_in_sync(tmp_path):
+    store = JsonItemStore(str(tmp_path / "database.json"))
+    store.add("A", {"name": "Apple", "type": "Fruit", "price": 1.0})
+    assert [item_id for item_id, _ in store.search("apple")] == ["A"]
+    store.add("B", {"name": "Pineapple", "type": "Fruit", "price": 2.0})
+    store.remove("A")
+    assert [item_id for item_id, _ in store.search("apple")] == ["B"]
+    assert store.match("fruit") == ["B"]
+    store.clear()
+    assert store.search("apple") == []
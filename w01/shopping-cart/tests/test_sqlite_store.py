@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from shopping_cart.cart import Cart
+from shopping_cart.item import Item
+from shopping_cart.sqlite_store import SELECT_ITEMS_BY_TYPE, SqliteItemStore
+from shopping_cart.store import JsonItemStore
+
+@pytest.fixture
+def cart(tmp_path):
+    cart = Cart(database_path=str(tmp_path / "database.db"), backend="sqlite")
+    cart.add_item_to_cart(Item(name="Apple", type="Fruit", _price=1.0))
+    cart.add_item_to_cart(Item(name="Pineapple", type="Fruit", _price=2.0))
+    cart.add_item_to_cart(Item(name="Onion", type="Vegetable", _price=3.5))
+    return cart
+
+def test_aggregates(cart):
+    assert cart.get_total_item_count() == 3
+    assert cart.get_total_price_of_items() == 6.5
+
+def test_search_items(cart):
+    assert sorted(item.name for item in cart.search_items("APPLE")) == ["Apple", "Pineapple"]
+    assert [item.name for item in cart.search_items("on")] == ["Onion"]
+    assert [item.name for item in cart.search_items("Onion Veg")] == ["Onion"]
+    assert cart.search_items("Banana") == []
+
+def test_remove_item_from_cart(cart):
+    cart.remove_item_from_cart("fruit")
+    assert [item_data["name"] for item_data in cart.get_all_items()["Items"].values()] == ["Onion"]
+
+def test_get_items_by_type_uses_the_index(cart, monkeypatch):
+    monkeypatch.setattr(cart.store, "columns", None)  # no snapshot of every row
+    assert [item.name for item in cart.get_items_by_type("FRUIT")] == ["Apple", "Pineapple"]
+    plan = cart.store.connection.execute("EXPLAIN QUERY PLAN " + SELECT_ITEMS_BY_TYPE, ("fruit",)).fetchall()
+    assert any("items_type" in row[-1] for row in plan)
+
+def test_changes_are_persisted(cart):
+    cart.empty_cart()
+    cart.add_item_to_cart(Item(name="Milk", type="Drink", _price=4.0, _id="MILK01"))
+    store = SqliteItemStore(cart.database_path)
+    assert store.items == {"MILK01": {"name": "Milk", "type": "Drink", "price": 4.0}}
+    assert [item_id for item_id, _ in store.get_items_by_type("drink")] == ["MILK01"]
+
+def test_pending_changes_committed_at_exit(tmp_path):
+    database = str(tmp_path / "database.db")
+    code = (
+        "from shopping_cart.sqlite_store import SqliteItemStore\n"
+        f"store = SqliteItemStore({database!r}, flush_interval=None)\n"
+        "store.add('MILK01', {'name': 'Milk', 'type': 'Drink', 'price': 4.0})\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(__file__)), check=True)
+    assert list(SqliteItemStore(database).items) == ["MILK01"]
+
+def test_import_json(tmp_path):
+    json_path = tmp_path / "database.json"
+    json_path.write_text(json.dumps({"Items": {"AAAAAA": {"name": "Apple", "type": "Fruit", "price": 1.0}}}))
+    store = SqliteItemStore(str(tmp_path / "database.db"))
+    store.import_json(str(json_path))
+    assert store.count() == 1
+    assert store.match("app") == ["AAAAAA"]
+
+def test_import_json_with_journal(tmp_path):
+    json_path = str(tmp_path / "database.json")
+    source = JsonItemStore(json_path, journal=True)
+    source.add("AAAAAA", {"name": "Apple", "type": "Fruit", "price": 1.0})
+    store = SqliteItemStore(str(tmp_path / "database.db"))
+    store.import_json(json_path)  # no snapshot yet, only the journal
+    assert list(store.items) == ["AAAAAA"]
+
+    source.compact()
+    source.add("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0})
+    source.remove("AAAAAA")
+    store.import_json(json_path)
+    assert list(store.items) == ["BBBBBB"]
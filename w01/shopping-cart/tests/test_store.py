@@ -0,0 +1,163 @@
+import gc
+import json
+import os
+import subprocess
+import sys
+import pytest
+from shopping_cart.cart import Cart
+from shopping_cart.item import Item
+from shopping_cart import store as store_module
+from shopping_cart.store import JsonItemStore, StreamingJsonItemStore
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "database.json"
+    path.write_text(json.dumps({"Items": {"AAAAAA": {"name": "Apple", "type": "Fruit", "price": 1.0}}}))
+    return str(path)
+
+def read_items(path):
+    with open(path) as data_file:
+        return json.load(data_file)["Items"]
+
+def test_write_through_by_default(database):
+    store = JsonItemStore(database)
+    store.add("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0})
+    assert "BBBBBB" in read_items(database)
+
+def test_write_back_on_flush(database):
+    store = JsonItemStore(database, flush_interval=None)
+    store.add("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0})
+    assert store.dirty
+    assert "BBBBBB" not in read_items(database)
+    store.flush()
+    assert "BBBBBB" in read_items(database)
+
+def test_reload_when_file_changes(database):
+    store = JsonItemStore(database)
+    assert list(store.items) == ["AAAAAA"]
+    with open(database, 'w') as data_file:
+        json.dump({"Items": {}}, data_file)
+    os.utime(database, ns=(0, 0))
+    assert store.items == {}
+
+def test_cart_flushes_on_exit(database):
+    with Cart(database_path=database, flush_interval=None) as cart:
+        cart.add_item_to_cart(Item(name="Banana", type="Fruit", _price=2.0, _id="BBBBBB"))
+        assert cart.get_total_item_count() == 2
+        assert "BBBBBB" not in read_items(database)
+    assert "BBBBBB" in read_items(database)
+
+def test_pending_changes_flushed_at_exit(database):
+    code = (
+        "from shopping_cart.store import JsonItemStore\n"
+        f"store = JsonItemStore({database!r}, flush_interval=None)\n"
+        "store.add('BBBBBB', {'name': 'Banana', 'type': 'Fruit', 'price': 2.0})\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(__file__)), check=True)
+    assert "BBBBBB" in read_items(database)
+
+def test_dropped_cart_flushed_at_exit(tmp_path):
+    database = str(tmp_path / "database.json")
+
+    def fill_cart():
+        cart = Cart(database_path=database, flush_interval=None)
+        cart.add_item_to_cart(Item(name="Banana", type="Fruit", _price=2.0, _id="BBBBBB"))
+
+    fill_cart()
+    gc.collect()
+    assert not os.path.exists(database)
+    store_module._flush_at_exit()
+    assert list(read_items(database)) == ["BBBBBB"]
+
+def test_get_all_items_returns_a_copy(database):
+    cart = Cart(database_path=database)
+    items = cart.get_all_items()["Items"]
+    items["AAAAAA"]["price"] = 100.0
+    items.pop("AAAAAA")
+    assert cart.get_all_items()["Items"] == {"AAAAAA": {"name": "Apple", "type": "Fruit", "price": 1.0}}
+    assert cart.get_total_item_count() == 1
+    cart.store.verify_totals()
+
+def test_journal_appends_changes(database):
+    store = JsonItemStore(database, journal=True)
+    store.add("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0})
+    store.remove("AAAAAA")
+    assert "AAAAAA" in read_items(database)
+    with open(store.journal_path) as journal_file:
+        assert len(journal_file.readlines()) == 2
+    assert list(JsonItemStore(database).items) == ["BBBBBB"]
+
+def test_journal_sync_skips_own_entries(database, monkeypatch):
+    first = JsonItemStore(database, journal=True)
+    second = JsonItemStore(database, journal=True)
+    first.add("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0})
+    second.add("CCCCCC", {"name": "Cherry", "type": "Fruit", "price": 3.0})
+    applied = []
+    apply = JsonItemStore._apply
+    monkeypatch.setattr(JsonItemStore, "_apply", lambda store, entry: applied.append(entry["id"]) or apply(store, entry))
+    assert sorted(first.items) == ["AAAAAA", "BBBBBB", "CCCCCC"]
+    assert applied == ["CCCCCC"]
+
+def test_journal_compaction(database):
+    store = JsonItemStore(database, journal=True, compact_threshold=200)
+    for i in range(10):
+        store.add(f"ITEM{i:02d}", {"name": "Banana", "type": "Fruit", "price": 2.0})
+    assert len(read_items(database)) > 1
+    store.compact()
+    assert not os.path.exists(store.journal_path)
+    assert len(read_items(database)) == 11
+
+def test_journal_ignores_truncated_line(database):
+    store = JsonItemStore(database, journal=True)
+    store.add("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0})
+    with open(store.journal_path, 'a') as journal_file:
+        journal_file.write('{"op": "remove", "id": "AA')
+    assert sorted(JsonItemStore(database).items) == ["AAAAAA", "BBBBBB"]
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_rebase_on_version_when_signature_matches(database, journal):
+    first = JsonItemStore(database, journal=journal)
+    second = JsonItemStore(database, journal=journal)
+    second.add("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0})
+    # A file replaced with the same inode, size and mtime looks unchanged
+    first._stat = lambda: first._signature
+    first.add("CCCCCC", {"name": "Cherry", "type": "Fruit", "price": 3.0})
+    assert sorted(JsonItemStore(database).items) == ["AAAAAA", "BBBBBB", "CCCCCC"]
+    assert first.version == 2
+
+def test_totals_are_persisted(database, monkeypatch):
+    store = JsonItemStore(database)
+    store.add("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.15})
+    with open(database) as data_file:
+        assert json.load(data_file)["Totals"] == {"count": 2, "price": "3.15"}
+
+    # A cold load must reuse the saved totals instead of scanning the items
+    monkeypatch.setattr(store_module, "sum_prices", None)
+    store = JsonItemStore(database)
+    assert store.count() == 2
+    assert str(store.total_price()) == "3.15"
+
+def test_verify_totals(database):
+    store = JsonItemStore(database, journal=True)
+    store.add("AAAAAA", {"name": "Apple", "type": "Fruit", "price": 1.5})
+    store.remove("AAAAAA")
+    store.verify_totals()
+    store.data["Items"]["BBBBBB"] = {"name": "Banana", "type": "Fruit", "price": 2.0}
+    with pytest.raises(ValueError):
+        store.verify_totals()
+
+def test_streaming_store(database):
+    store = StreamingJsonItemStore(database)
+    store.add_many([("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0}), ("AAAAAA", {"name": "Apricot", "type": "Fruit", "price": 0.5})])
+    assert list(store.iter_items()) == [
+        ("AAAAAA", {"name": "Apricot", "type": "Fruit", "price": 0.5}),
+        ("BBBBBB", {"name": "Banana", "type": "Fruit", "price": 2.0}),
+    ]
+    assert (store.count(), str(store.total_price())) == (2, "2.50")
+    assert store.match("ban") == ["BBBBBB"]
+    with pytest.raises(KeyError):
+        store.remove_many(["BBBBBB", "CCCCCC"])
+    assert store.count() == 2
+    assert store.remove("BBBBBB")["name"] == "Banana"
+    store.verify_totals()
+    assert JsonItemStore(database).items == {"AAAAAA": {"name": "Apricot", "type": "Fruit", "price": 0.5}}
@@ -1,20 +1,83 @@
 import heapq
+import math
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # render_maze falls back to building the rows one cell at a time
+    np = None
+
+SQRT2 = math.sqrt(2)
+HEURISTICS = ("manhattan", "octile", "chebyshev")
+CORNER_CUTTING = ("never", "one_wall", "always")
 
 class AStarPathFinding:
-    def __init__(self, maze, start_pos, target_pos):
+    """A* on a grid maze where 1 is an open cell and 0 a wall.
+
+    connectivity: 4 moves only up/down/left/right, 8 also moves diagonally
+        (cost sqrt(2)).
+    corner_cutting: when a diagonal move may pass between the two cells
+        beside it, "never" if either is a wall, "one_wall" if only one
+        is, "always" even between two walls.
+    heuristic_type: "manhattan", "octile" or "chebyshev", by default
+        manhattan for 4 connectivity and octile, the exact cost of an
+        empty map, for 8. Manhattan overestimates diagonal paths, so only
+        the other two keep 8 connected paths optimal.
+    tie_break: among cells with the same f score expand the ones closest
+        to the target first, which on open maps follows a single path
+        instead of the whole frontier of equally good ones.
+    jump_points: use Jump Point Search, which skips over the symmetric
+        paths of open areas and only expands the cells where the path may
+        turn. The path returned is as short as plain A*'s and lists every
+        cell like find_path does without it. Needs corner_cutting "never".
+    """
+
+    def __init__(self, maze, start_pos, target_pos, connectivity=4, jump_points=False,
+                 corner_cutting="never", heuristic_type=None, tie_break=True):
+        if connectivity not in (4, 8):
+            raise ValueError("connectivity has to be 4 or 8")
+        if corner_cutting not in CORNER_CUTTING:
+            raise ValueError(f"corner_cutting has to be one of {CORNER_CUTTING}")
+        if heuristic_type is None:
+            heuristic_type = "octile" if connectivity == 8 else "manhattan"
+        if heuristic_type not in HEURISTICS:
+            raise ValueError(f"heuristic_type has to be one of {HEURISTICS}")
+        if jump_points and corner_cutting != "never":
+            raise ValueError("jump_points only supports corner_cutting='never'")
         self.maze = maze
+        self.height = len(maze)
+        self.width = len(maze[0]) if len(maze) else 0
         self.start_pos = start_pos
         self.target_pos = target_pos
+        self.connectivity = connectivity
+        self.jump_points = jump_points
+        self.corner_cutting = corner_cutting
+        self.heuristic_type = heuristic_type
+        self.tie_break = tie_break
         self.open_set = []
         self.closed_set = set()
         self.came_from = {}
+        self.expanded = 0
         # self.g_score = {start_pos: 0}
         # self.f_score = {start_pos: self.heuristic(start_pos, target_pos)}
         # heapq.heappush(self.open_set, (self.f_score[start_pos], start_pos))
         
     def heuristic(self, a, b):
+        d_row, d_col = abs(a[0] - b[0]), abs(a[1] - b[1])
+        if self.heuristic_type == "octile":
+            return SQRT2 * min(d_row, d_col) + abs(d_row - d_col)
+        if self.heuristic_type == "chebyshev":
+            return max(d_row, d_col)
         # Using Manhattan distance as heuristic
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+        return d_row + d_col
+
+    def distance(self, a, b):
+        """Cost of the straight or diagonal line between two cells."""
+        d_row, d_col = abs(a[0] - b[0]), abs(a[1] - b[1])
+        if self.connectivity == 4:
+            return d_row + d_col
+        # Octile distance: diagonal steps first, then straight ones
+        return SQRT2 * min(d_row, d_col) + abs(d_row - d_col)
     
     def get_neighbors(self, pos):
         neighbors = []
@@ -23,70 +86,226 @@ class AStarPathFinding:
             neighbor = (pos[0] + direction[0], pos[1] + direction[1])
             if self.is_valid_position(neighbor):
                 neighbors.append(neighbor)
+        if self.connectivity == 8:
+            for d_row, d_col in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+                if self.can_move_diagonally(pos, d_row, d_col):
+                    neighbors.append((pos[0] + d_row, pos[1] + d_col))
         return neighbors
     
     def is_valid_position(self, pos):
         row, col = pos
-        return (0 <= row < len(self.maze) and 0 <= col < len(self.maze[0])) and self.maze[row][col] == 1
+        return (0 <= row < self.height and 0 <= col < self.width) and self.maze[row][col] == 1
+
+    def is_open(self, row, col):
+        return 0 <= row < self.height and 0 <= col < self.width and self.maze[row][col] == 1
+
+    def can_move_diagonally(self, pos, d_row, d_col):
+        row, col = pos
+        if not self.is_open(row + d_row, col + d_col):
+            return False
+        if self.corner_cutting == "always":
+            return True
+        open_sides = self.is_open(row + d_row, col) + self.is_open(row, col + d_col)
+        return open_sides == 2 if self.corner_cutting == "never" else open_sides >= 1
+
+    def get_successors(self, pos):
+        """Cells reachable from pos, neighbors or jump points."""
+        if not self.jump_points:
+            return self.get_neighbors(pos)
+        successors = []
+        for neighbor in self.get_pruned_neighbors(pos):
+            jump_point = self.jump(neighbor, neighbor[0] - pos[0], neighbor[1] - pos[1])
+            if jump_point is not None:
+                successors.append(jump_point)
+        return successors
+
+    def get_pruned_neighbors(self, pos):
+        """Neighbors of pos that no shorter path through its parent reaches."""
+        if pos not in self.came_from:
+            return self.get_neighbors(pos)
+
+        row, col = pos
+        parent = self.came_from[pos]
+        d_row = (row > parent[0]) - (row < parent[0])
+        d_col = (col > parent[1]) - (col < parent[1])
+        is_open = self.is_open
+        neighbors = []
+
+        if self.connectivity == 4:
+            if d_col != 0:
+                candidates = [(row - 1, col), (row + 1, col), (row, col + d_col)]
+            else:
+                candidates = [(row, col - 1), (row, col + 1), (row + d_row, col)]
+            return [cell for cell in candidates if is_open(*cell)]
+
+        if d_row != 0 and d_col != 0:
+            vertical, horizontal = is_open(row + d_row, col), is_open(row, col + d_col)
+            if vertical:
+                neighbors.append((row + d_row, col))
+            if horizontal:
+                neighbors.append((row, col + d_col))
+            if vertical and horizontal and is_open(row + d_row, col + d_col):
+                neighbors.append((row + d_row, col + d_col))
+        elif d_col != 0:
+            ahead, up, down = is_open(row, col + d_col), is_open(row - 1, col), is_open(row + 1, col)
+            if ahead:
+                neighbors.append((row, col + d_col))
+                if up and is_open(row - 1, col + d_col):
+                    neighbors.append((row - 1, col + d_col))
+                if down and is_open(row + 1, col + d_col):
+                    neighbors.append((row + 1, col + d_col))
+            if up:
+                neighbors.append((row - 1, col))
+            if down:
+                neighbors.append((row + 1, col))
+        else:
+            ahead, left, right = is_open(row + d_row, col), is_open(row, col - 1), is_open(row, col + 1)
+            if ahead:
+                neighbors.append((row + d_row, col))
+                if left and is_open(row + d_row, col - 1):
+                    neighbors.append((row + d_row, col - 1))
+                if right and is_open(row + d_row, col + 1):
+                    neighbors.append((row + d_row, col + 1))
+            if left:
+                neighbors.append((row, col - 1))
+            if right:
+                neighbors.append((row, col + 1))
+        return neighbors
+
+    def jump(self, pos, d_row, d_col):
+        """Walk from pos in a direction until a jump point, None if none."""
+        row, col = pos
+        is_open = self.is_open
+        target_row, target_col = self.target_pos
+        while True:
+            if not is_open(row, col):
+                return None
+            if row == target_row and col == target_col:
+                return (row, col)
+
+            if d_row != 0 and d_col != 0:
+                # A diagonal stops where one of its straight branches finds a jump point
+                if self.jump((row + d_row, col), d_row, 0) or self.jump((row, col + d_col), 0, d_col):
+                    return (row, col)
+                if not (is_open(row + d_row, col) and is_open(row, col + d_col)):
+                    return None
+            elif d_col != 0:
+                # Forced neighbor: a side cell only reachable through this one
+                if (is_open(row - 1, col) and not is_open(row - 1, col - d_col)) or \
+                        (is_open(row + 1, col) and not is_open(row + 1, col - d_col)):
+                    return (row, col)
+            else:
+                if (is_open(row, col - 1) and not is_open(row - d_row, col - 1)) or \
+                        (is_open(row, col + 1) and not is_open(row - d_row, col + 1)):
+                    return (row, col)
+                if self.connectivity == 4:
+                    # Moving vertically, the turns are found by horizontal jumps
+                    if self.jump((row, col + 1), 0, 1) or self.jump((row, col - 1), 0, -1):
+                        return (row, col)
+
+            row += d_row
+            col += d_col
     
     def reconstruct_path(self, current):
         total_path = [current]
         while current in self.came_from:
-            current = self.came_from[current]
-            total_path.append(current)
+            previous = self.came_from[current]
+            if self.jump_points:
+                # Fill in the cells between consecutive jump points
+                d_row = (previous[0] > current[0]) - (previous[0] < current[0])
+                d_col = (previous[1] > current[1]) - (previous[1] < current[1])
+                cell = current
+                while cell != previous:
+                    cell = (cell[0] + d_row, cell[1] + d_col)
+                    total_path.append(cell)
+            else:
+                total_path.append(previous)
+            current = previous
         return total_path[::-1]  # Return reversed path
     
     def find_path(self):
-        heapq.heappush(self.open_set, (0, self.start_pos))
+        self.open_set = []
+        self.closed_set = set()
+        self.came_from = {}
+        self.expanded = 0
+        # Entries are (f, h, pos), h only breaks ties when tie_break is on
+        heapq.heappush(self.open_set, (0, 0, self.start_pos))
         
         g_score = {self.start_pos: 0}
         f_score = {self.start_pos: self.heuristic(self.start_pos, self.target_pos)}
         
         while self.open_set:
-            _, current = heapq.heappop(self.open_set)
+            _, _, current = heapq.heappop(self.open_set)
             
             if current == self.target_pos:
                 return self.reconstruct_path(current)
-            
+
+            if current in self.closed_set:
+                continue
             self.closed_set.add(current)
+            self.expanded += 1
             
-            for neighbor in self.get_neighbors(current):
+            for neighbor in self.get_successors(current):
                 if neighbor in self.closed_set:
                     continue
                 
-                tentative_g_score = g_score[current] + 1
+                tentative_g_score = g_score[current] + self.distance(current, neighbor)
                 
                 if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
                     self.came_from[neighbor] = current
                     g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = tentative_g_score + self.heuristic(neighbor, self.target_pos)
-                    heapq.heappush(self.open_set, (f_score[neighbor], neighbor))
+                    h_score = self.heuristic(neighbor, self.target_pos)
+                    f_score[neighbor] = tentative_g_score + h_score
+                    # Rounded so sums of sqrt(2) that differ by float error still tie
+                    entry = (round(f_score[neighbor], 9), h_score if self.tie_break else 0, neighbor)
+                    heapq.heappush(self.open_set, entry)
                     
         return None
 
-def render_maze(maze, path=None, start=None, target=None):
+def render_maze(maze, path=None, start=None, target=None, file=None):
     """Render the maze to stdout.
     Walls (0) shown as '#', open cells (1) as '.'.
     Path cells overridden with '█'. Start shown as 'S', target as 'T'.
+    With NumPy the whole text is built as one array of characters and
+    written at once, file can be any open text file instead of stdout.
     """
-    path_set = set(path) if path else set()
-    for r, row in enumerate(maze):
-        line_chars = []
-        for c, cell in enumerate(row):
-            pos = (r, c)
-            if pos == start:
-                line_chars.append('S ')
-            elif pos == target:
-                line_chars.append('T ')
-            elif pos in path_set:
-                line_chars.append('█ ')
-            else:
-                if cell == 0:
-                    line_chars.append('# ')
+    file = sys.stdout if file is None else file
+    if np is None:
+        path_set = set(path) if path else set()
+        for r, row in enumerate(maze):
+            line_chars = []
+            for c, cell in enumerate(row):
+                pos = (r, c)
+                if pos == start:
+                    line_chars.append('S ')
+                elif pos == target:
+                    line_chars.append('T ')
+                elif pos in path_set:
+                    line_chars.append('█ ')
                 else:
-                    line_chars.append('. ')
-        print(''.join(line_chars))
-    print()  # blank line for spacing
+                    if cell == 0:
+                        line_chars.append('# ')
+                    else:
+                        line_chars.append('. ')
+            print(''.join(line_chars), file=file)
+        print(file=file)  # blank line for spacing
+        return
+
+    grid = np.asarray(maze)
+    height, width = grid.shape if grid.size else (len(maze), 0)
+    # One code point per character: a symbol and a space per cell, then a newline
+    chars = np.full((height, 2 * width + 1), ord(' '), dtype='<u4')  # little endian like the codec
+    chars[:, -1] = ord('\n')
+    cells = chars[:, 0:-1:2]
+    cells[...] = np.where(grid == 0, ord('#'), ord('.'))
+    if path:
+        rows, cols = np.asarray(path).T
+        cells[rows, cols] = ord('█')
+    if target is not None:
+        cells[target] = ord('T')
+    if start is not None:
+        cells[start] = ord('S')
+    file.write(chars.tobytes().decode('utf-32-le') + '\n')  # blank line for spacing
     
 if __name__ == "__main__":
     maze = [
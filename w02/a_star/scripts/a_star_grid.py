@@ -0,0 +1,77 @@
+import heapq
+import numpy as np
+from padded_grid import PaddedGrid
+
+class GridAStarPathFinding(PaddedGrid):
+    """A* over a NumPy boolean grid, for large mazes.
+
+    Takes the same arguments as AStarPathFinding and returns the same
+    list of (row, col) tuples, but cells are plain integers into the padded
+    flat grid of PaddedGrid. g-scores, parents and closed flags live in flat
+    preallocated arrays instead of dicts keyed by tuples, and bounds checks
+    disappear.
+    """
+
+    def __init__(self, maze, start_pos, target_pos):
+        super().__init__(np.asarray(maze, dtype=bool))
+        self.start_pos = start_pos
+        self.target_pos = target_pos
+
+        size = len(self.walkable)
+        self.g_score = np.full(size, np.iinfo(np.int32).max, dtype=np.int32)
+        self.came_from = np.full(size, -1, dtype=np.int32)
+        self.closed = np.zeros(size, dtype=np.uint8)
+
+    def reconstruct_path(self, current):
+        came_from = memoryview(self.came_from)
+        total_path = [self.to_pos(current)]
+        while came_from[current] != -1:
+            current = came_from[current]
+            total_path.append(self.to_pos(current))
+        return total_path[::-1]  # Return reversed path
+
+    def find_path(self):
+        if not (self.is_inside(self.start_pos) and self.is_inside(self.target_pos)):
+            return None
+        start = self.to_index(self.start_pos)
+        target = self.to_index(self.target_pos)
+
+        self.g_score.fill(np.iinfo(np.int32).max)
+        self.came_from.fill(-1)
+        self.closed.fill(0)
+
+        # memoryviews give fast scalar access to the NumPy buffers
+        walkable = memoryview(self.walkable)
+        g_score = memoryview(self.g_score)
+        came_from = memoryview(self.came_from)
+        closed = memoryview(self.closed)
+
+        width = self.padded_width
+        target_row, target_col = divmod(target, width)
+        offsets = (-width, width, -1, 1)  # Up, Down, Left, Right
+
+        g_score[start] = 0
+        # Entries are (f, h, index), among equal f the cells closest to the target go first
+        open_set = [(0, 0, start)]
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+
+            if current == target:
+                return self.reconstruct_path(current)
+            if closed[current]:
+                continue  # Stale heap entry
+            closed[current] = 1
+
+            tentative_g_score = g_score[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if not walkable[neighbor] or closed[neighbor]:
+                    continue
+                if tentative_g_score < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    row, col = divmod(neighbor, width)
+                    h_score = abs(row - target_row) + abs(col - target_col)
+                    heapq.heappush(open_set, (tentative_g_score + h_score, h_score, neighbor))
+
+        return None
@@ -0,0 +1,65 @@
+"""
+Benchmark of incremental replanning with D* Lite
+
+Plans across a large random maze once, then repeatedly closes or opens a
+few cells on and around the current path and times the D* Lite repair
+against planning again from zero with AStarPathFinding, checking both find
+paths of the same length. Run from this folder:
+    python bench_d_star_lite.py --size 1024 --edits 10 --cells 3
+"""
+import argparse
+import random
+import time
+from a_star import AStarPathFinding
+from bench_jps import random_maze
+from d_star_lite import DStarLite
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--wall-ratio", type=float, default=0.2)
+    parser.add_argument("--edits", type=int, default=10, help="number of replans")
+    parser.add_argument("--cells", type=int, default=3, help="cells changed before each replan")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    maze = random_maze(args.size, args.wall_ratio)
+    start_pos, target_pos = (0, 0), (args.size - 1, args.size - 1)
+
+    start = time.perf_counter()
+    planner = DStarLite(maze, start_pos, target_pos)
+    path = planner.find_path()
+    print(f"{'initial plan':>16} {(time.perf_counter() - start) * 1000:>10.2f} ms {planner.expanded:>9} expanded")
+
+    repair_times, full_times = [], []
+    for _ in range(args.edits):
+        if path is None:
+            break
+        changes = []
+        for _ in range(args.cells):
+            # Mostly block the current path, sometimes open a cell near it
+            row, col = rng.choice(path[1:-1])
+            if rng.random() < 0.3:
+                row = min(max(row + rng.randint(-3, 3), 0), args.size - 1)
+                col = min(max(col + rng.randint(-3, 3), 0), args.size - 1)
+                changes.append(((row, col), 1))
+            else:
+                changes.append(((row, col), 0))
+        for (row, col), value in changes:
+            maze[row][col] = value
+
+        start = time.perf_counter()
+        planner.update_cells(changes)
+        path = planner.find_path()
+        repair_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        full_path = AStarPathFinding(maze, start_pos, target_pos).find_path()
+        full_times.append(time.perf_counter() - start)
+        assert (path is None) == (full_path is None) and (path is None or len(path) == len(full_path))
+        print(f"{'replan':>16} {repair_times[-1] * 1000:>10.2f} ms {planner.expanded:>9} expanded"
+              f"   full A* {full_times[-1] * 1000:>10.2f} ms")
+
+    if repair_times:
+        repair, full = sorted(repair_times)[len(repair_times) // 2], sorted(full_times)[len(full_times) // 2]
+        print(f"{'median':>16} {repair * 1000:>10.2f} ms vs {full * 1000:.2f} ms, {full / repair:.1f}x faster")
@@ -0,0 +1,40 @@
+"""
+Benchmark of the heuristics and tie-breaking of AStarPathFinding
+
+Runs every connectivity / heuristic combination with and without the
+h-based tie-break on random maps from empty to cluttered, and prints the
+nodes expanded, the wall time and the path cost. Run from this folder:
+    python bench_heuristics.py --size 200 --wall-ratios 0 0.05 0.2
+"""
+import argparse
+import time
+from a_star import AStarPathFinding
+from bench_jps import path_cost, random_maze
+
+CONFIGS = [
+    (4, "manhattan"),
+    (8, "octile"),
+    (8, "chebyshev"),
+]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--wall-ratios", type=float, nargs="+", default=[0, 0.05, 0.2])
+    args = parser.parse_args()
+
+    start_pos, target_pos = (0, 0), (args.size - 1, args.size // 3)
+    for wall_ratio in args.wall_ratios:
+        maze = random_maze(args.size, wall_ratio)
+        maze[target_pos[0]][target_pos[1]] = 1
+        for connectivity, heuristic_type in CONFIGS:
+            for tie_break in (False, True):
+                pathfinder = AStarPathFinding(
+                    maze, start_pos, target_pos, connectivity, heuristic_type=heuristic_type, tie_break=tie_break
+                )
+                start = time.perf_counter()
+                path = pathfinder.find_path()
+                elapsed = time.perf_counter() - start
+                cost = round(path_cost(path), 3) if path else None
+                label = f"walls {wall_ratio:.2f} {connectivity}-conn {heuristic_type}{' tie-break' if tie_break else ''}"
+                print(f"{label:>40} {pathfinder.expanded:>9} expanded {elapsed * 1000:>10.2f} ms  cost {cost}")
@@ -0,0 +1,52 @@
+"""
+Benchmark of hierarchical pathfinding against plain A*
+
+Builds a HierarchicalPathFinding on a large random maze, then times random
+queries with it and with AStarPathFinding, the length of its paths compared
+with the optimal ones, and the update after a cell toggles. Run from this folder:
+    python bench_hpa.py --size 512 --cluster-size 16 --queries 20
+"""
+import argparse
+import random
+import time
+from a_star import AStarPathFinding
+from bench_jps import random_maze
+from bench_path_finder import random_queries
+from hpa_star import HierarchicalPathFinding
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--wall-ratio", type=float, default=0.2)
+    parser.add_argument("--cluster-size", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    maze = random_maze(args.size, args.wall_ratio)
+    start = time.perf_counter()
+    hierarchy = HierarchicalPathFinding(maze, args.cluster_size)
+    print(f"{'build':>16} {(time.perf_counter() - start) * 1000:>10.2f} ms")
+
+    a_star_time = hpa_time = 0
+    ratios = []
+    for start_pos, target_pos in random_queries(maze, args.queries):
+        start = time.perf_counter()
+        optimal = AStarPathFinding(maze, start_pos, target_pos).find_path()
+        a_star_time += time.perf_counter() - start
+        start = time.perf_counter()
+        path = hierarchy.find_path(start_pos, target_pos)
+        hpa_time += time.perf_counter() - start
+        assert (optimal is None) == (path is None)
+        if optimal:
+            ratios.append(len(path) / len(optimal))
+    print(f"{'A* query':>16} {a_star_time / args.queries * 1000:>10.2f} ms")
+    print(f"{'HPA* query':>16} {hpa_time / args.queries * 1000:>10.2f} ms")
+    if ratios:
+        print(f"{'path length':>16} {sum(ratios) / len(ratios):>10.3f}x optimal on average, {max(ratios):.3f}x at worst")
+
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(100):
+        row, col = rng.randrange(args.size), rng.randrange(args.size)
+        hierarchy.set_cell((row, col), 1 - hierarchy.maze[row][col])
+    print(f"{'set_cell':>16} {(time.perf_counter() - start) / 100 * 1000:>10.2f} ms")
@@ -0,0 +1,60 @@
+"""
+Benchmark of Jump Point Search against plain A*
+
+Runs both on the complex maze of a_star.py and on large random mazes, with
+4 and 8 connectivity, and prints the nodes expanded, the wall time and the
+path cost of each. Run from this folder:
+    python bench_jps.py --sizes 128 256 512 --wall-ratio 0.15
+"""
+import argparse
+import math
+import random
+import time
+from a_star import AStarPathFinding
+
+COMPLEX_MAZE = [
+    [1, 0, 1, 1, 1, 0, 1],
+    [1, 0, 1, 0, 1, 0, 1],
+    [1, 1, 1, 0, 1, 1, 1],
+    [0, 0, 0, 0, 0, 0, 1],
+    [1, 1, 1, 1, 1, 1, 1]
+]
+
+def random_maze(size, wall_ratio, seed=0):
+    """Square maze with random walls, its corners are kept open."""
+    rng = random.Random(seed)
+    maze = [[0 if rng.random() < wall_ratio else 1 for _ in range(size)] for _ in range(size)]
+    maze[0][0] = maze[size - 1][size - 1] = 1
+    return maze
+
+def path_cost(path):
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
+def run_case(name, maze, start_pos, target_pos, repeat):
+    for connectivity in (4, 8):
+        costs = set()
+        for jump_points in (False, True):
+            timings = []
+            for _ in range(repeat):
+                pathfinder = AStarPathFinding(maze, start_pos, target_pos, connectivity, jump_points)
+                start = time.perf_counter()
+                path = pathfinder.find_path()
+                timings.append(time.perf_counter() - start)
+            cost = path_cost(path) if path else None
+            costs.add(None if cost is None else round(cost, 6))
+            label = f"{name} {connectivity}-conn {'JPS' if jump_points else 'A*'}"
+            print(f"{label:>32} {pathfinder.expanded:>9} expanded {min(timings) * 1000:>10.2f} ms  cost {cost}")
+        if len(costs) != 1:
+            raise AssertionError(f"JPS and A* disagree on {name}: {costs}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[128, 256, 512])
+    parser.add_argument("--wall-ratio", type=float, default=0.15)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run_case("complex_maze", COMPLEX_MAZE, (0, 0), (4, 4), args.repeat)
+    for size in args.sizes:
+        maze = random_maze(size, args.wall_ratio)
+        run_case(f"random {size}x{size}", maze, (0, 0), (size - 1, size - 1), args.repeat)
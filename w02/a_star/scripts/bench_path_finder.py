@@ -0,0 +1,49 @@
+"""
+Benchmark of batched queries with PathFinder
+
+Answers the same random start/target queries with a new AStarPathFinding
+per query, with one PathFinder, and with PathFinder over a process pool,
+and checks they find paths of the same length. Run from this folder:
+    python bench_path_finder.py --size 256 --queries 1000 --workers 4
+"""
+import argparse
+import os
+import random
+import time
+from a_star import AStarPathFinding
+from bench_jps import random_maze
+from path_finder import PathFinder
+
+def random_queries(maze, count, seed=0):
+    rng = random.Random(seed)
+    open_cells = [(row, col) for row, cells in enumerate(maze) for col, cell in enumerate(cells) if cell == 1]
+    return [(rng.choice(open_cells), rng.choice(open_cells)) for _ in range(count)]
+
+def timed(label, function, count):
+    start = time.perf_counter()
+    paths = function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>24} {elapsed * 1000:>10.2f} ms {count / elapsed:>10.0f} queries/s")
+    return [len(path) if path else None for path in paths]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--wall-ratio", type=float, default=0.2)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    maze = random_maze(args.size, args.wall_ratio)
+    queries = random_queries(maze, args.queries)
+
+    lengths = timed(
+        "AStarPathFinding each", lambda: [AStarPathFinding(maze, start, target).find_path() for start, target in queries],
+        len(queries),
+    )
+    with PathFinder(maze) as path_finder:
+        assert timed("PathFinder", lambda: path_finder.find_paths(queries), len(queries)) == lengths
+        # The first batch also starts the workers, the second one reuses them
+        for label in ("PathFinder pool, cold", "PathFinder pool, warm"):
+            paths = timed(label, lambda: path_finder.find_paths(queries, workers=args.workers), len(queries))
+            assert paths == lengths
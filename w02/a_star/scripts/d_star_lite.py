@@ -0,0 +1,149 @@
+import heapq
+from padded_grid import PaddedGrid
+
+INF = float("inf")
+
+class DStarLite(PaddedGrid):
+    """Incremental replanning with D* Lite on a 4-connected maze.
+
+    The search runs backward, from the target to the start, and keeps its
+    g and rhs values between plans. When cells change, update_cells only
+    puts the cells around them back in the open set, and the next
+    find_path repairs the part of the previous solution they affect instead
+    of searching from zero. move_start lets an agent walking the path keep
+    the same search.
+
+    Cells are indices into the padded flat grid of PaddedGrid.
+    """
+
+    def __init__(self, maze, start_pos, target_pos):
+        super().__init__(maze)
+        size = len(self.walkable)
+        self.offsets = (-self.padded_width, self.padded_width, -1, 1)  # Up, Down, Left, Right
+        self.g_score = [INF] * size
+        self.rhs = [INF] * size  # One step lookahead of g_score
+        self.open_set = []
+        self.open_keys = {}  # cell -> its current key, heap entries with another one are stale
+        self.km = 0  # Sum of the heuristic distances the start moved by
+        self.expanded = 0
+        # Cells outside the maze are None, find_path then returns None
+        self.start_row, self.start_col = start_pos[0] + 1, start_pos[1] + 1
+        self.start = self.to_index(start_pos) if self.is_inside(start_pos) else None
+        self.target = self.to_index(target_pos) if self.is_inside(target_pos) else None
+
+        if self.target is not None:
+            self.rhs[self.target] = 0
+            self._push(self.target)
+
+    def heuristic(self, index):
+        # Manhattan distance to the start, the search runs backward
+        row, col = divmod(index, self.padded_width)
+        return abs(row - self.start_row) + abs(col - self.start_col)
+
+    def calculate_key(self, index):
+        score = min(self.g_score[index], self.rhs[index])
+        return (score + self.heuristic(index) + self.km, score)
+
+    def _push(self, index):
+        key = self.calculate_key(index)
+        self.open_keys[index] = key
+        heapq.heappush(self.open_set, (key, index))
+
+    def _top(self):
+        """The smallest current entry of the open set, or None."""
+        open_set, open_keys = self.open_set, self.open_keys
+        while open_set:
+            key, index = open_set[0]
+            if open_keys.get(index) == key:
+                return key, index
+            heapq.heappop(open_set)  # Stale entry
+        return None
+
+    def update_vertex(self, index):
+        if index != self.target:
+            if self.walkable[index]:
+                g_score, walkable = self.g_score, self.walkable
+                self.rhs[index] = 1 + min(
+                    (g_score[index + offset] for offset in self.offsets if walkable[index + offset]), default=INF
+                )
+            else:
+                self.rhs[index] = INF
+        self.open_keys.pop(index, None)
+        if self.g_score[index] != self.rhs[index]:
+            self._push(index)
+
+    def compute_shortest_path(self):
+        g_score, rhs, walkable, offsets = self.g_score, self.rhs, self.walkable, self.offsets
+        start = self.start
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            key, current = top
+            if key >= self.calculate_key(start) and rhs[start] == g_score[start]:
+                break
+            self.expanded += 1
+
+            new_key = self.calculate_key(current)
+            if key < new_key:
+                self._push(current)  # The start moved since it was queued
+            elif g_score[current] > rhs[current]:
+                # Overconsistent: its distance got shorter, pass it on
+                g_score[current] = rhs[current]
+                del self.open_keys[current]
+                heapq.heappop(self.open_set)
+                for offset in offsets:
+                    if walkable[current + offset]:
+                        self.update_vertex(current + offset)
+            else:
+                # Underconsistent: its distance got longer, recompute it and its neighbors
+                g_score[current] = INF
+                self.update_vertex(current)
+                for offset in offsets:
+                    if walkable[current + offset]:
+                        self.update_vertex(current + offset)
+
+    def update_cells(self, changes):
+        """Applies changed cells, the next find_path repairs the path.
+
+        Args:
+            changes: (pos, value) pairs, value 1 opens the cell and 0 closes it
+        """
+        for pos, value in changes:
+            if not self.is_inside(pos):
+                raise IndexError(f"{pos} is outside the maze")
+            index = self.to_index(pos)
+            if self.walkable[index] == (value == 1):
+                continue
+            self.walkable[index] = value == 1
+            self.update_vertex(index)
+            for offset in self.offsets:
+                if self.walkable[index + offset]:
+                    self.update_vertex(index + offset)
+
+    def move_start(self, start_pos):
+        """Moves the start, for an agent that walked part of the path."""
+        row, col = start_pos[0] + 1, start_pos[1] + 1
+        self.km += abs(row - self.start_row) + abs(col - self.start_col)
+        self.start_row, self.start_col = row, col
+        self.start = self.to_index(start_pos) if self.is_inside(start_pos) else None
+
+    def find_path(self):
+        """Repairs the search and returns the path from start to target, or None."""
+        self.expanded = 0
+        if self.start is None or self.target is None or not self.walkable[self.start]:
+            return None
+        self.compute_shortest_path()
+        if self.g_score[self.start] == INF:
+            return None
+
+        g_score, walkable = self.g_score, self.walkable
+        current = self.start
+        path = [self.to_pos(current)]
+        while current != self.target:
+            # Step to the neighbor closest to the target
+            current = min(
+                (current + offset for offset in self.offsets if walkable[current + offset]), key=g_score.__getitem__
+            )
+            path.append(self.to_pos(current))
+        return path
@@ -0,0 +1,224 @@
+import heapq
+from collections import deque
+from a_star import AStarPathFinding
+
+ENTRANCE_SPLIT = 6  # Openings at least this wide get an entrance at each end
+
+class HierarchicalPathFinding:
+    """Hierarchical A* (HPA*) for large 4-connected mazes.
+
+    The maze is cut in square clusters. Where two neighboring clusters share
+    a run of open cells across their border, the run becomes an entrance: a
+    pair of cells facing each other, one node in each cluster. The distances
+    between the nodes of a cluster are computed once with a search limited
+    to the cluster. A query connects its start and target to the nodes of
+    their clusters, searches this small abstract graph, then refines each
+    abstract step with AStarPathFinding inside a single cluster.
+
+    Paths are near-optimal, usually a few percent longer than plain A*'s,
+    since they go through the entrance cells. set_cell toggles a cell and
+    only rebuilds the entrances and distances of the clusters it touches.
+    """
+
+    def __init__(self, maze, cluster_size=16):
+        self.maze = [list(row) for row in maze]
+        self.height = len(maze)
+        self.width = len(maze[0]) if len(maze) else 0
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-self.height // cluster_size)
+        self.cluster_cols = -(-self.width // cluster_size)
+        self.entrances = {}  # border -> [(cell, facing cell)]
+        self.inter_edges = {}  # node -> set of facing nodes, one step away
+        self.intra_edges = {}  # cluster -> {node: {node: distance}}
+        self.expanded = 0
+
+        for cluster_row in range(self.cluster_rows):
+            for cluster_col in range(self.cluster_cols):
+                if cluster_col + 1 < self.cluster_cols:
+                    self._build_border(((cluster_row, cluster_col), (cluster_row, cluster_col + 1)))
+                if cluster_row + 1 < self.cluster_rows:
+                    self._build_border(((cluster_row, cluster_col), (cluster_row + 1, cluster_col)))
+        for cluster_row in range(self.cluster_rows):
+            for cluster_col in range(self.cluster_cols):
+                self._build_cluster((cluster_row, cluster_col))
+
+    def is_valid_position(self, pos):
+        row, col = pos
+        return 0 <= row < self.height and 0 <= col < self.width and self.maze[row][col] == 1
+
+    def cluster_of(self, pos):
+        return (pos[0] // self.cluster_size, pos[1] // self.cluster_size)
+
+    def cluster_bounds(self, cluster):
+        """(top, left, bottom, right) of a cluster, bottom and right excluded."""
+        top, left = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+        return top, left, min(top + self.cluster_size, self.height), min(left + self.cluster_size, self.width)
+
+    def borders_of(self, cluster):
+        """The borders shared with the neighboring clusters."""
+        cluster_row, cluster_col = cluster
+        borders = []
+        for neighbor in ((cluster_row - 1, cluster_col), (cluster_row, cluster_col - 1)):
+            if neighbor[0] >= 0 and neighbor[1] >= 0:
+                borders.append((neighbor, cluster))
+        for neighbor in ((cluster_row + 1, cluster_col), (cluster_row, cluster_col + 1)):
+            if neighbor[0] < self.cluster_rows and neighbor[1] < self.cluster_cols:
+                borders.append((cluster, neighbor))
+        return borders
+
+    def nodes_of(self, cluster):
+        nodes = set()
+        for border in self.borders_of(cluster):
+            for pair in self.entrances.get(border, ()):
+                nodes.update(cell for cell in pair if self.cluster_of(cell) == cluster)
+        return nodes
+
+    def _build_border(self, border):
+        """Finds the entrances of a border, returns True if they changed."""
+        first, second = border
+        top, left, bottom, right = self.cluster_bounds(first)
+        if second[1] > first[1]:
+            # Vertical border, the last column of first faces the first one of second
+            pairs = [((row, right - 1), (row, right)) for row in range(top, bottom)]
+        else:
+            pairs = [((bottom - 1, col), (bottom, col)) for col in range(left, right)]
+
+        entrances = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and self.is_valid_position(pair[0]) and self.is_valid_position(pair[1]):
+                run.append(pair)
+                continue
+            if len(run) >= ENTRANCE_SPLIT:
+                entrances.extend((run[0], run[-1]))
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+
+        previous = self.entrances.get(border, [])
+        self.entrances[border] = entrances
+        if entrances == previous:
+            return False
+        for cell, facing in previous:
+            self.inter_edges[cell].discard(facing)
+            self.inter_edges[facing].discard(cell)
+        for cell, facing in entrances:
+            self.inter_edges.setdefault(cell, set()).add(facing)
+            self.inter_edges.setdefault(facing, set()).add(cell)
+        return True
+
+    def _cluster_distances(self, cluster, source):
+        """Distances from source to the cells of its cluster it can reach."""
+        top, left, bottom, right = self.cluster_bounds(cluster)
+        distances = {source: 0}
+        queue = deque([source])
+        while queue:
+            row, col = queue.popleft()
+            for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if neighbor in distances or not (top <= neighbor[0] < bottom and left <= neighbor[1] < right):
+                    continue
+                if self.maze[neighbor[0]][neighbor[1]] == 1:
+                    distances[neighbor] = distances[(row, col)] + 1
+                    queue.append(neighbor)
+        return distances
+
+    def _build_cluster(self, cluster):
+        nodes = self.nodes_of(cluster)
+        edges = {}
+        for node in nodes:
+            distances = self._cluster_distances(cluster, node)
+            edges[node] = {other: distances[other] for other in nodes if other != node and other in distances}
+        self.intra_edges[cluster] = edges
+
+    def set_cell(self, pos, value):
+        """Opens (1) or closes (0) a cell and updates the clusters around it."""
+        row, col = pos
+        if self.maze[row][col] == value:
+            return
+        self.maze[row][col] = value
+        cluster = self.cluster_of(pos)
+        changed = {cluster}
+        for border in self.borders_of(cluster):
+            if self._build_border(border):
+                changed.update(border)
+        for changed_cluster in changed:
+            self._build_cluster(changed_cluster)
+
+    def _local_path(self, cluster, start_pos, target_pos):
+        """Path between two cells with AStarPathFinding inside one cluster."""
+        top, left, bottom, right = self.cluster_bounds(cluster)
+        sub_maze = [row[left:right] for row in self.maze[top:bottom]]
+        path = AStarPathFinding(
+            sub_maze, (start_pos[0] - top, start_pos[1] - left), (target_pos[0] - top, target_pos[1] - left)
+        ).find_path()
+        return [(row + top, col + left) for row, col in path]
+
+    def _query_edges(self, pos):
+        """Distances from a query cell to the nodes of its cluster."""
+        cluster = self.cluster_of(pos)
+        distances = self._cluster_distances(cluster, pos)
+        return {node: distances[node] for node in self.intra_edges[cluster] if node in distances and node != pos}
+
+    def find_abstract_path(self, start_pos, target_pos):
+        """The nodes the path goes through, from start_pos to target_pos."""
+        start_edges = self._query_edges(start_pos)
+        target_edges = self._query_edges(target_pos)
+        if self.cluster_of(start_pos) == self.cluster_of(target_pos):
+            distances = self._cluster_distances(self.cluster_of(start_pos), start_pos)
+            if target_pos in distances:
+                start_edges[target_pos] = distances[target_pos]
+
+        def neighbors(node):
+            if node == start_pos:
+                yield from start_edges.items()
+            for facing in self.inter_edges.get(node, ()):
+                yield facing, 1
+            yield from self.intra_edges[self.cluster_of(node)].get(node, {}).items()
+            if node in target_edges:
+                yield target_pos, target_edges[node]
+
+        def heuristic(node):
+            return abs(node[0] - target_pos[0]) + abs(node[1] - target_pos[1])
+
+        g_score = {start_pos: 0}
+        came_from = {}
+        closed = set()
+        open_set = [(heuristic(start_pos), start_pos)]
+        self.expanded = 0
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current == target_pos:
+                path = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    path.append(current)
+                return path[::-1]
+            if current in closed:
+                continue
+            closed.add(current)
+            self.expanded += 1
+            for neighbor, cost in neighbors(current):
+                tentative_g_score = g_score[current] + cost
+                if neighbor not in closed and tentative_g_score < g_score.get(neighbor, float("inf")):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    heapq.heappush(open_set, (tentative_g_score + heuristic(neighbor), neighbor))
+        return None
+
+    def find_path(self, start_pos, target_pos):
+        """Returns a path of adjacent cells from start_pos to target_pos, or None."""
+        if not (self.is_valid_position(start_pos) and self.is_valid_position(target_pos)):
+            return None
+        if start_pos == target_pos:
+            return [start_pos]
+        abstract_path = self.find_abstract_path(start_pos, target_pos)
+        if abstract_path is None:
+            return None
+
+        path = [start_pos]
+        for current, following in zip(abstract_path, abstract_path[1:]):
+            if following in self.inter_edges.get(current, ()):
+                path.append(following)  # Crossing a border is a single step
+            else:
+                path.extend(self._local_path(self.cluster_of(current), current, following)[1:])
+        return path
@@ -0,0 +1,79 @@
+import struct
+import zlib
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:  # without Pillow only the PNGs written by save_maze can be loaded
+    Image = None
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def save_maze(path, maze):
+    """Save a maze of 0 (wall) and 1 (open) cells.
+
+    A .png path writes a black and white image with one pixel per cell,
+    white for open cells. Anything else writes a NumPy .npz archive of the
+    cells packed 8 per byte at exactly that path, a 4096x4096 maze takes 2 MiB.
+    """
+    grid = np.asarray(maze, dtype=bool)
+    if str(path).lower().endswith('.png'):
+        with open(path, 'wb') as file:
+            file.write(encode_png(grid))
+    else:
+        # Through a file object, np.savez would add .npz to a path without it
+        with open(path, 'wb') as file:
+            np.savez(file, bits=np.packbits(grid, axis=None), shape=np.array(grid.shape))
+
+def load_maze(path):
+    """Load a maze written by save_maze, as a uint8 array of 0 and 1.
+
+    The array works with every pathfinder, call .tolist() for plain lists.
+    """
+    if str(path).lower().endswith('.png'):
+        if Image is not None:
+            with Image.open(path) as image:
+                return (np.asarray(image.convert('L')) >= 128).astype(np.uint8)
+        with open(path, 'rb') as file:
+            return decode_png(file.read())
+    with np.load(path) as archive:
+        height, width = archive['shape']
+        return np.unpackbits(archive['bits'], count=height * width).reshape(height, width)
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+def encode_png(grid):
+    """1 bit grayscale PNG of a boolean grid."""
+    height, width = grid.shape
+    rows = np.packbits(grid, axis=1)
+    # Every row starts with its filter type, 0 means unfiltered
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), rows]).tobytes()
+    header = struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0)
+    return PNG_SIGNATURE + _chunk(b'IHDR', header) + _chunk(b'IDAT', zlib.compress(raw)) + _chunk(b'IEND', b'')
+
+def decode_png(data):
+    """Reads back a PNG written by encode_png, as a uint8 array of 0 and 1."""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("Not a PNG file")
+    offset = len(PNG_SIGNATURE)
+    header = None
+    compressed = []
+    while offset < len(data):
+        length, kind = struct.unpack('>I4s', data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif kind == b'IDAT':
+            compressed.append(body)
+        elif kind == b'IEND':
+            break
+    if header is None or header[2:] != (1, 0, 0, 0, 0):
+        raise ValueError("Only 1 bit grayscale PNGs can be read without Pillow")
+
+    width, height = header[0], header[1]
+    raw = np.frombuffer(zlib.decompress(b''.join(compressed)), dtype=np.uint8).reshape(height, -1)
+    if raw[:, 0].any():
+        raise ValueError("Only unfiltered PNGs can be read without Pillow")
+    return np.unpackbits(raw[:, 1:], axis=1, count=width)
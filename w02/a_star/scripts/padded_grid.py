@@ -0,0 +1,32 @@
+class PaddedGrid:
+    """A maze padded with a border of walls and flattened.
+
+    Cells are plain integers (row * padded_width + col) into the walkable
+    bytearray. A wall border means neighbors of open cells never leave the
+    grid, so searches need no bounds checks, but positions coming from the
+    caller still have to be checked with is_inside before to_index: outside
+    the maze they would land on another cell.
+    """
+
+    def __init__(self, maze):
+        self.height = len(maze)
+        self.width = len(maze[0]) if len(maze) else 0
+        self.padded_width = self.width + 2
+        self.walkable = bytearray((self.height + 2) * self.padded_width)
+        for row, cells in enumerate(maze):
+            start = (row + 1) * self.padded_width + 1
+            if hasattr(cells, "tobytes"):
+                cells = (cells == 1).tobytes()  # NumPy row, converted in one go
+            else:
+                cells = bytes(int(cell == 1) for cell in cells)
+            self.walkable[start:start + self.width] = cells
+
+    def is_inside(self, pos):
+        return 0 <= pos[0] < self.height and 0 <= pos[1] < self.width
+
+    def to_index(self, pos):
+        return (pos[0] + 1) * self.padded_width + pos[1] + 1
+
+    def to_pos(self, index):
+        row, col = divmod(index, self.padded_width)
+        return (row - 1, col - 1)
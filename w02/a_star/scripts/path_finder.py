@@ -0,0 +1,185 @@
+import heapq
+import math
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from padded_grid import PaddedGrid
+
+SQRT2 = math.sqrt(2)
+GENERATION_LIMIT = 2 ** 32 - 1
+
+class PathFinder(PaddedGrid):
+    """A* answering many start/target queries on the same maze.
+
+    The maze is padded with a border of walls and flattened once, and the
+    per-cell scores, parents and closed flags are allocated once. Instead of
+    clearing them before every query, each cell remembers the generation of
+    the query that last wrote it, and anything from an older generation
+    counts as unset.
+
+    find_paths answers a batch of queries, across a pool of processes when
+    workers is given. The pool is kept between batches until close().
+    """
+
+    def __init__(self, maze, connectivity=4):
+        if connectivity not in (4, 8):
+            raise ValueError("connectivity has to be 4 or 8")
+        super().__init__(maze)
+        self.maze = maze
+        self.connectivity = connectivity
+
+        size = len(self.walkable)
+        self.g_score = [0.0] * size
+        self.came_from = array('l', [-1]) * size
+        self.visited = array('L', [0]) * size  # generation that set g_score and came_from
+        self.closed = array('L', [0]) * size  # generation that expanded the cell
+        self.generation = 0
+        self.expanded = 0
+        self._pool = None
+        self._workers = None
+
+    def is_valid_position(self, pos):
+        return self.is_inside(pos) and self.walkable[self.to_index(pos)]
+
+    def _next_generation(self):
+        self.generation += 1
+        if self.generation == GENERATION_LIMIT:
+            # Wrapped around, old marks could pass for new ones
+            size = len(self.walkable)
+            self.visited = array('L', [0]) * size
+            self.closed = array('L', [0]) * size
+            self.generation = 1
+        return self.generation
+
+    def _moves(self):
+        """(offset, cost, side_a, side_b) of each move, the sides must be open."""
+        width = self.padded_width
+        # A straight move has no sides, offset 0 is the current cell itself
+        moves = [(-width, 1, 0, 0), (width, 1, 0, 0), (-1, 1, 0, 0), (1, 1, 0, 0)]  # Up, Down, Left, Right
+        if self.connectivity == 8:
+            # No corner cutting: both cells beside the diagonal must be open
+            for d_row in (-width, width):
+                for d_col in (-1, 1):
+                    moves.append((d_row + d_col, SQRT2, d_row, d_col))
+        return moves
+
+    def reconstruct_path(self, current):
+        total_path = [self.to_pos(current)]
+        while self.came_from[current] != -1:
+            current = self.came_from[current]
+            total_path.append(self.to_pos(current))
+        return total_path[::-1]  # Return reversed path
+
+    def find_path(self, start_pos, target_pos):
+        """Returns the shortest path from start_pos to target_pos, or None."""
+        if not (self.is_valid_position(start_pos) and self.is_valid_position(target_pos)):
+            return None
+        generation = self._next_generation()
+        start = self.to_index(start_pos)
+        target = self.to_index(target_pos)
+
+        walkable, g_score, came_from = self.walkable, self.g_score, self.came_from
+        visited, closed = self.visited, self.closed
+        width = self.padded_width
+        target_row, target_col = divmod(target, width)
+        octile = self.connectivity == 8
+        moves = self._moves()
+
+        g_score[start] = 0
+        came_from[start] = -1
+        visited[start] = generation
+        # Entries are (f, h, index), among equal f the cells closest to the target go first
+        open_set = [(0, 0, start)]
+        expanded = 0
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+
+            if current == target:
+                self.expanded = expanded
+                return self.reconstruct_path(current)
+            if closed[current] == generation:
+                continue  # Stale heap entry
+            closed[current] = generation
+            expanded += 1
+
+            current_g = g_score[current]
+            for offset, cost, side_a, side_b in moves:
+                neighbor = current + offset
+                if not walkable[neighbor] or closed[neighbor] == generation:
+                    continue
+                if not (walkable[current + side_a] and walkable[current + side_b]):
+                    continue
+                tentative_g_score = current_g + cost
+                if visited[neighbor] != generation or tentative_g_score < g_score[neighbor]:
+                    visited[neighbor] = generation
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    row, col = divmod(neighbor, width)
+                    d_row, d_col = abs(row - target_row), abs(col - target_col)
+                    if octile:
+                        h_score = SQRT2 * min(d_row, d_col) + abs(d_row - d_col)
+                        # Rounded so sums of sqrt(2) that differ by float error still tie
+                        f_score = round(tentative_g_score + h_score, 9)
+                    else:
+                        h_score = d_row + d_col
+                        f_score = tentative_g_score + h_score
+                    heapq.heappush(open_set, (f_score, h_score, neighbor))
+
+        self.expanded = expanded
+        return None
+
+    def find_paths(self, queries, workers=None, chunksize=None):
+        """Answers a batch of queries.
+
+        Args:
+            queries: (start_pos, target_pos) pairs
+            workers: Number of processes to spread the queries over, None
+                answers them in this process
+            chunksize: Queries sent to a worker at a time, by default the
+                batch is split in about four chunks per worker
+
+        Returns:
+            list: The path of each query, or None, in the order of queries
+        """
+        queries = list(queries)
+        if not workers or workers < 2 or len(queries) < 2:
+            return [self.find_path(start_pos, target_pos) for start_pos, target_pos in queries]
+
+        if self._pool is None or self._workers != workers:
+            self.close()
+            # Each worker builds its own PathFinder once, then serves every batch
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(self.maze, self.connectivity)
+            )
+            self._workers = workers
+        if chunksize is None:
+            chunksize = max(1, len(queries) // (workers * 4))
+        return list(self._pool.map(_find_path_worker, queries, chunksize=chunksize))
+
+    def close(self):
+        """Shuts down the worker processes of find_paths."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._workers = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None  # A pool cannot be sent to another process
+        state["_workers"] = None
+        return state
+
+_worker_path_finder = None
+
+def _init_worker(maze, connectivity):
+    global _worker_path_finder
+    _worker_path_finder = PathFinder(maze, connectivity)
+
+def _find_path_worker(query):
+    start_pos, target_pos = query
+    return _worker_path_finder.find_path(start_pos, target_pos)
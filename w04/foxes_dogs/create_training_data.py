@@ -1,44 +1,108 @@
 import numpy as np
-import pickle
+import json
 import random
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 import cv2
+from dataset_files import CATEGORIES, IMG_SIZE, METADATA_PATH, SEED, X_PATH, Y_PATH, list_images
 
-DATADIR = "./data"
-CATEGORIES = ["fox", "dog"]
-IMG_SIZE = 50
-
-training_data = []
-def create_tr_data():
-    for category in CATEGORIES:
-        path = os.path.join(DATADIR, category)
-        class_num = CATEGORIES.index(category)
-        for img_name in tqdm(os.listdir(path)):
-            try:
-                img_path = os.path.join(path, img_name)
-                img_array = cv2.imread(img_path, cv2.IMREAD_GRAYSCALE)
-                resized_array = cv2.resize(img_array, (IMG_SIZE, IMG_SIZE))
-                training_data.append((resized_array, class_num))
-            except Exception as e:
-                pass
-            
-create_tr_data()
-print(len(training_data))
-
-random.shuffle(training_data)
-
-X = []
-y = []
-
-for features, label in training_data:
-    X.append(features)
-    y.append(label)
-    
-X = np.array(X).reshape(-1, IMG_SIZE, IMG_SIZE, 1)
-
-with open('X.pkl', 'wb') as f:
-    pickle.dump(X, f)
-    
-with open('y.pkl', 'wb') as f:
-    pickle.dump(y, f)
\ No newline at end of file
+CHUNK_SIZE = 256 # images decoded per task sent to a worker process
+
+def init_worker():
+    # One process per core already, keep OpenCV from starting its own threads
+    cv2.setNumThreads(1)
+
+def load_image(img_path):
+    """
+    Reads an image as grayscale and resizes it
+
+    Returns the resized array and None, or None and the reason it was skipped
+    """
+    try:
+        img_array = cv2.imread(img_path, cv2.IMREAD_GRAYSCALE)
+        if img_array is None:
+            return None, "cannot be read as an image"
+        return cv2.resize(img_array, (IMG_SIZE, IMG_SIZE)), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def load_chunk(img_paths):
+    return [load_image(img_path) for img_path in img_paths]
+
+def truncate_rows(path, count, chunk_size=CHUNK_SIZE):
+    """
+    Rewrites a .npy file with only its first count rows, copied in chunks through a temporary file
+    """
+    source = np.load(path, mmap_mode="r")[:count]
+    tmp_path = path + ".tmp"
+    target = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=source.dtype, shape=(count, *source.shape[1:]))
+    for start in range(0, count, chunk_size):
+        target[start:start + chunk_size] = source[start:start + chunk_size]
+    target.flush()
+    del source, target
+    os.replace(tmp_path, path)
+
+def create_tr_data(x_path=X_PATH, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Decodes and resizes the images in chunks across processes, one per core by default,
+    straight into a preallocated uint8 .npy file
+
+    The images are shuffled with SEED before loading, so the file is in a
+    repeatable random order and batches can be read as contiguous slices.
+    When files are skipped, the file is then shrunk to the len(labels) rows
+    that hold images, so it lines up with the labels.
+
+    Returns the labels of the stored images and the (path, reason) of the
+    skipped files
+    """
+    images = list_images()
+    random.Random(SEED).shuffle(images)
+    chunks = [images[i:i + chunk_size] for i in range(0, len(images), chunk_size)]
+    X = np.lib.format.open_memmap(x_path, mode="w+", dtype=np.uint8, shape=(len(images), IMG_SIZE, IMG_SIZE, 1))
+    labels = []
+    skipped = []
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool, tqdm(total=len(images)) as progress:
+        # map returns the chunks in the order they were submitted
+        results = pool.map(load_chunk, [[img_path for img_path, _ in chunk] for chunk in chunks])
+        for chunk, chunk_results in zip(chunks, results):
+            for (img_path, class_num), (resized_array, reason) in zip(chunk, chunk_results):
+                if reason is None:
+                    X[len(labels), :, :, 0] = resized_array
+                    labels.append(class_num)
+                else:
+                    skipped.append((img_path, reason))
+            progress.update(len(chunk))
+    elapsed = time.perf_counter() - start
+
+    X.flush()
+    del X
+    if skipped:
+        truncate_rows(x_path, len(labels))
+    print(f"Loaded {len(labels)} images in {elapsed:.1f}s ({len(images) / elapsed:.0f} images/sec)")
+    if skipped:
+        print(f"Skipped {len(skipped)} files:")
+        for img_path, reason in skipped:
+            print(f"  {img_path}: {reason}")
+    return labels, skipped
+
+if __name__ == "__main__":
+    labels, skipped = create_tr_data()
+    print(len(labels))
+
+    np.save(Y_PATH, np.array(labels, dtype=np.uint8))
+
+    metadata = {
+        "count": len(labels),
+        "shape": [len(labels), IMG_SIZE, IMG_SIZE, 1],
+        "dtype": "uint8",
+        "categories": CATEGORIES,
+        "img_size": IMG_SIZE,
+        "seed": SEED,
+        "skipped": [{"path": img_path, "reason": reason} for img_path, reason in skipped],
+    }
+    with open(METADATA_PATH, 'w') as f:
+        json.dump(metadata, f, indent=4)
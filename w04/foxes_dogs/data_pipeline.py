@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import numpy as np
+import tensorflow as tf
+from dataset_files import IMG_SIZE, METADATA_PATH, SEED, X_PATH, Y_PATH, list_images
+
+AUTOTUNE = tf.data.AUTOTUNE
+BATCH_SIZE = 32
+VALIDATION_SPLIT = 0.3
+CACHE_DIR = "cache"
+# Leading bytes of the formats tf.io.decode_image reads: JPEG, PNG, GIF and BMP
+IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n", b"GIF87a", b"GIF89a", b"BM")
+
+def split_indices(count, validation_split=VALIDATION_SPLIT, seed=SEED):
+    """
+    Shuffles the indices of the samples and splits them in training and validation
+    """
+    indices = np.random.default_rng(seed).permutation(count)
+    split = count - int(count * validation_split)
+    return indices[:split], indices[split:]
+
+def normalize(images, labels):
+    return tf.cast(images, tf.float32) / 255.0, labels # Normalize pixel values
+
+def load_image(img_path, label):
+    img_array = tf.io.decode_image(tf.io.read_file(img_path), channels=1, expand_animations=False)
+    resized_array = tf.image.resize(img_array, (IMG_SIZE, IMG_SIZE))
+    return tf.cast(tf.round(resized_array), tf.uint8), label
+
+def check_images(img_paths):
+    """
+    Flags the files tf.io.decode_image can't read from their first bytes,
+    so they are reported and left out instead of failing inside the pipeline
+
+    Returns a boolean array of the readable files and the (path, reason) of the others
+    """
+    readable = np.ones(len(img_paths), dtype=bool)
+    skipped = []
+    for index, img_path in enumerate(img_paths):
+        try:
+            with open(img_path, 'rb') as f:
+                header = f.read(8)
+        except OSError as e:
+            readable[index] = False
+            skipped.append((img_path, f"{type(e).__name__}: {e}"))
+            continue
+        if not header.startswith(IMAGE_SIGNATURES):
+            readable[index] = False
+            skipped.append((img_path, "not a JPEG, PNG, GIF or BMP image"))
+    return readable, skipped
+
+def image_dataset(img_paths, labels, training, cache_path=None):
+    """
+    Streams the images from their files, decoding and resizing them in parallel
+
+    The resized uint8 images are cached to cache_path during the first epoch,
+    later epochs read the cache instead of decoding again. The files should
+    have gone through check_images: the ones with an image header that still
+    fail to decode are dropped with a logged warning.
+    """
+    dataset = tf.data.Dataset.from_tensor_slices((img_paths, labels))
+    dataset = dataset.map(load_image, num_parallel_calls=AUTOTUNE, deterministic=False)
+    dataset = dataset.ignore_errors(log_warning=True)
+    if cache_path is not None:
+        dataset = dataset.cache(cache_path)
+    if training:
+        dataset = dataset.shuffle(4096, seed=SEED, reshuffle_each_iteration=True)
+    dataset = dataset.batch(BATCH_SIZE)
+    dataset = dataset.map(normalize, num_parallel_calls=AUTOTUNE)
+    return dataset.prefetch(AUTOTUNE)
+
+def npy_dataset(X, y, indices, training):
+    """
+    Batches gathered from the memory-mapped uint8 images of create_training_data.py
+    """
+    def read_batch(batch_indices):
+        rows = np.sort(batch_indices) # file order, the reads go forward
+        return np.asarray(X[rows]), np.asarray(y[rows])
+
+    def read(batch_indices):
+        images, labels = tf.numpy_function(read_batch, [batch_indices], (tf.uint8, tf.uint8))
+        images.set_shape((None, *X.shape[1:]))
+        labels.set_shape((None,))
+        return images, labels
+
+    dataset = tf.data.Dataset.from_tensor_slices(indices)
+    if training:
+        dataset = dataset.shuffle(len(indices), seed=SEED, reshuffle_each_iteration=True)
+    dataset = dataset.batch(BATCH_SIZE)
+    dataset = dataset.map(read, num_parallel_calls=AUTOTUNE)
+    dataset = dataset.map(normalize, num_parallel_calls=AUTOTUNE)
+    return dataset.prefetch(AUTOTUNE)
+
+def cache_key(img_paths, labels, validation_split=VALIDATION_SPLIT, seed=SEED):
+    """
+    Fingerprint of everything the cached images depend on: the files with
+    their sizes and modification times, the labels, the split and the image size
+    """
+    digest = hashlib.sha1(f"{IMG_SIZE} {validation_split} {seed}".encode())
+    for img_path, label in zip(img_paths, labels):
+        stat = os.stat(img_path)
+        digest.update(f"\n{img_path} {label} {stat.st_size} {stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+def load_image_datasets(cache_dir=CACHE_DIR):
+    """
+    Training and validation datasets streamed from the image folders in DATADIR
+
+    The caches go to a folder of cache_dir named after cache_key, so adding
+    images or changing the split starts new caches instead of reusing stale
+    ones, older folders can be deleted. A cache is written by the first pass
+    that reads its dataset to the end, and only one process can write it at a
+    time: sweep.py fills it before starting its workers.
+    """
+    img_paths, labels = zip(*list_images())
+    img_paths, labels = np.array(img_paths), np.array(labels, dtype=np.uint8)
+    readable, skipped = check_images(img_paths)
+    if skipped:
+        print(f"Skipped {len(skipped)} files:")
+        for img_path, reason in skipped:
+            print(f"  {img_path}: {reason}")
+    img_paths, labels = img_paths[readable], labels[readable]
+    train_indices, validation_indices = split_indices(len(labels))
+    cache_paths = (None, None)
+    if cache_dir is not None:
+        cache_dir = os.path.join(cache_dir, cache_key(img_paths, labels))
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_paths = (os.path.join(cache_dir, "train"), os.path.join(cache_dir, "validation"))
+    return (
+        image_dataset(img_paths[train_indices], labels[train_indices], True, cache_paths[0]),
+        image_dataset(img_paths[validation_indices], labels[validation_indices], False, cache_paths[1]),
+    )
+
+def load_npy_datasets():
+    """
+    Training and validation datasets read from X.npy and y.npy
+    """
+    with open(METADATA_PATH) as f:
+        metadata = json.load(f)
+
+    # Opening the arrays memory-mapped only reads the pages the batches touch
+    X = np.load(X_PATH, mmap_mode="r")[:metadata["count"]]
+    y = np.load(Y_PATH)
+    train_indices, validation_indices = split_indices(len(y))
+    return npy_dataset(X, y, train_indices, True), npy_dataset(X, y, validation_indices, False)
@@ -0,0 +1,22 @@
+import os
+
+DATADIR = "./data"
+CATEGORIES = ["fox", "dog"]
+IMG_SIZE = 50
+SEED = 42
+X_PATH = "X.npy"
+Y_PATH = "y.npy"
+METADATA_PATH = "dataset.json"
+DATA_SOURCE = "npy" # or "images" to stream the image folders without create_training_data.py
+
+def list_images():
+    """
+    Returns the (path, class_num) of every image, sorted so runs are repeatable
+    """
+    images = []
+    for category in CATEGORIES:
+        path = os.path.join(DATADIR, category)
+        class_num = CATEGORIES.index(category)
+        for img_name in sorted(os.listdir(path)):
+            images.append((os.path.join(path, img_name), class_num))
+    return images
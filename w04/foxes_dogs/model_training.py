@@ -1,60 +1,91 @@
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense, Dropout, Activation, Flatten
+from tensorflow.keras.layers import Dense, Activation, Flatten
 from tensorflow.keras.layers import Conv2D, MaxPooling2D
 from tensorflow.keras.callbacks import TensorBoard
 from tensorflow.keras.optimizers import Adam
-import pickle
-import numpy as np
+import data_pipeline
 import time
+from dataset_files import DATA_SOURCE
 
-gpus = tf.config.experimental.list_physical_devices('GPU')
-for gpu in gpus:
-  tf.config.experimental.set_memory_growth(gpu, True)
+EPOCHS = 10
+
+def configure_tf(threads=None):
+    """
+    Enables GPU memory growth and optionally caps the CPU threads of TensorFlow,
+    must run before TensorFlow builds anything
+    """
+    if threads:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    gpus = tf.config.experimental.list_physical_devices('GPU')
+    for gpu in gpus:
+      tf.config.experimental.set_memory_growth(gpu, True)
 
 # https://poloclub.github.io/cnn-explainer/
 
-X = np.asarray(pickle.load(open("X.pkl", "rb")))
-y = np.asarray(pickle.load(open("y.pkl", "rb")))
+def load_dataset(source=DATA_SOURCE):
+    """
+    Returns the input shape and the training and validation datasets
+
+    Args:
+        source: "npy" reads the arrays written by create_training_data.py,
+            "images" streams and decodes the image folders, caching them
+            to disk after the first epoch
+    """
+    if source == "images":
+        train_dataset, validation_dataset = data_pipeline.load_image_datasets()
+    elif source == "npy":
+        train_dataset, validation_dataset = data_pipeline.load_npy_datasets()
+    else:
+        raise ValueError(f"Unknown dataset source '{source}', expected 'npy' or 'images'")
+    return tuple(train_dataset.element_spec[0].shape[1:]), train_dataset, validation_dataset
+
+def config_name(conv_layer, layer_size, dense_layer):
+    return f"{conv_layer}-conv-{layer_size}-nodes-{dense_layer}-dense"
 
-X = X / 255.0 # Normalize pixel values
+def build_model(conv_layer, layer_size, dense_layer, input_shape):
+    model = Sequential()
+    
+    model.add(Conv2D(layer_size, (3, 3), input_shape=input_shape)) # input_shape "1:" from the second element onward
+    model.add(Activation('relu'))
+    model.add(MaxPooling2D(pool_size=(2, 2)))
+    
+    for l in range(conv_layer - 1):
+        model.add(Conv2D(layer_size, (3, 3)))
+        model.add(Activation('relu'))
+        model.add(MaxPooling2D(pool_size=(2, 2)))
+        
+    model.add(Flatten()) # this converts our 3D feature maps to 1D feature vectors
+    
+    for _ in range(dense_layer):
+        model.add(Dense(layer_size))
+        model.add(Activation('relu'))
+        
+    model.add(Dense(1))
+    model.add(Activation('sigmoid'))
+    
+    model.compile(loss='binary_crossentropy',
+                  optimizer=Adam(),
+                  metrics=['accuracy'])
+    return model
 
 dense = [0, 1, 2]
 layer_sizes = [32, 64, 128]
 conv_layers = [1, 2, 3]
 
-for dense_layer in dense:
-    for layer_size in layer_sizes:
-        for conv_layer in conv_layers:
-            NAME = f"{conv_layer}-conv-{layer_size}-nodes-{dense_layer}-dense-{int(time.time())}"
-            print(NAME)
-            
-            model = Sequential()
-            
-            model.add(Conv2D(layer_size, (3, 3), input_shape=X.shape[1:])) # input_shape "1:" from the second element onward
-            model.add(Activation('relu'))
-            model.add(MaxPooling2D(pool_size=(2, 2)))
-            
-            for l in range(conv_layer - 1):
-                model.add(Conv2D(layer_size, (3, 3)))
-                model.add(Activation('relu'))
-                model.add(MaxPooling2D(pool_size=(2, 2)))
+if __name__ == "__main__":
+    configure_tf()
+    input_shape, train_dataset, validation_dataset = load_dataset()
+
+    for dense_layer in dense:
+        for layer_size in layer_sizes:
+            for conv_layer in conv_layers:
+                NAME = f"{config_name(conv_layer, layer_size, dense_layer)}-{int(time.time())}"
+                print(NAME)
                 
-            model.add(Flatten()) # this converts our 3D feature maps to 1D feature vectors
-            
-            for _ in range(dense_layer):
-                model.add(Dense(layer_size))
-                model.add(Activation('relu'))
+                model = build_model(conv_layer, layer_size, dense_layer, input_shape)
                 
-            model.add(Dense(1))
-            model.add(Activation('sigmoid'))
-            
-            tensorboard = TensorBoard(log_dir=f'logs/{NAME}')
-            
-            model.compile(loss='binary_crossentropy',
-                          optimizer=Adam(),
-                          metrics=['accuracy'])
-            
-            model.fit(X, y, batch_size=32, epochs=10, validation_split=0.3, callbacks=[tensorboard])
-            
-
+                tensorboard = TensorBoard(log_dir=f'logs/{NAME}')
+                
+                model.fit(train_dataset, epochs=EPOCHS, validation_data=validation_dataset, callbacks=[tensorboard])
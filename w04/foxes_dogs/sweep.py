@@ -0,0 +1,180 @@
+"""
+Parallel hyperparameter sweep of the model_training.py configurations
+
+Trains the conv / nodes / dense grid across a pool of processes, each one
+limited to a few CPU threads so the workers don't fight over the cores.
+With successive halving every configuration first trains for a short
+budget, only the best 1/eta of them continue to the next, longer budget,
+and so on up to the full number of epochs. Models are saved between
+rungs, so survivors resume training instead of starting over.
+
+Writes a summary of validation accuracy against wall time per config.
+Run from the foxes_dogs folder, after create_training_data.py:
+    python sweep.py --workers 4 --threads 2
+    python sweep.py --no-halving   # the whole grid for the full epochs
+"""
+import argparse
+import csv
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from dataset_files import DATA_SOURCE
+
+CHECKPOINT_DIR = "sweep"
+SUMMARY_PATH = "sweep_summary.csv"
+
+# Set by init_worker in each worker process
+model_training = None
+dataset = None
+
+def init_worker(threads):
+    global model_training, dataset
+    # Thread pools are sized when the libraries load, so limit them before importing TensorFlow
+    for variable in ("OMP_NUM_THREADS", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"):
+        os.environ[variable] = str(threads)
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    import model_training as training
+    training.configure_tf(threads)
+    model_training = training
+    dataset = training.load_dataset()
+
+def fill_cache():
+    """
+    Reads the datasets once, so the tf.data caches of the image folders are
+    complete before several workers open them
+    """
+    _, train_dataset, validation_dataset = dataset
+    for split in (train_dataset, validation_dataset):
+        for _ in split:
+            pass
+
+def train_config(config, epochs, initial_epoch):
+    """
+    Trains a configuration from initial_epoch up to epochs, resuming from its checkpoint
+
+    Returns:
+        dict: The config, its accuracies after the last epoch and the seconds it took
+    """
+    from tensorflow.keras.callbacks import TensorBoard
+    from tensorflow.keras.models import load_model
+
+    start = time.perf_counter()
+    input_shape, train_dataset, validation_dataset = dataset
+    name = model_training.config_name(*config)
+    checkpoint = os.path.join(CHECKPOINT_DIR, f"{name}.keras")
+    if initial_epoch > 0:
+        model = load_model(checkpoint)
+    else:
+        model = model_training.build_model(*config, input_shape)
+
+    history = model.fit(
+        train_dataset, epochs=epochs, initial_epoch=initial_epoch, validation_data=validation_dataset,
+        callbacks=[TensorBoard(log_dir=f'logs/sweep/{name}')], verbose=0,
+    )
+    model.save(checkpoint)
+    return {
+        "config": config,
+        "accuracy": history.history["accuracy"][-1],
+        "val_accuracy": history.history["val_accuracy"][-1],
+        "seconds": time.perf_counter() - start,
+    }
+
+def config_key(config):
+    return "-".join(map(str, config))
+
+def budgets(min_epochs, max_epochs, eta):
+    """
+    Epochs trained by the end of each rung, e.g. 1, 3, 9, 10
+    """
+    rungs = []
+    epochs = min_epochs
+    while epochs < max_epochs:
+        rungs.append(epochs)
+        epochs *= eta
+    rungs.append(max_epochs)
+    return rungs
+
+def run_sweep(configs, rungs, eta, workers, threads):
+    """
+    Runs the rungs of successive halving, all the configs go through the first one
+
+    Returns:
+        dict: The result of each config, keyed by its name
+    """
+    results = {}
+    survivors = list(configs)
+    trained = 0
+    if workers > 1 and DATA_SOURCE == "images":
+        # Workers writing the same tf.data cache at once fail on its lockfile, one process writes it first
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"),
+                                 initializer=init_worker, initargs=(threads,)) as pool:
+            pool.submit(fill_cache).result()
+    # TensorFlow doesn't survive a fork, the workers are started fresh
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                             initializer=init_worker, initargs=(threads,)) as pool:
+        for rung, epochs in enumerate(rungs):
+            print(f"Rung {rung}: {len(survivors)} configs up to {epochs} epochs")
+            futures = [pool.submit(train_config, config, epochs, trained) for config in survivors]
+            for future in as_completed(futures):
+                result = future.result()
+                name = config_key(result["config"])
+                previous = results.get(name, {"seconds": 0})
+                result["seconds"] += previous["seconds"]
+                result["epochs"] = epochs
+                results[name] = result
+                print(f"  {'conv {} nodes {} dense {}'.format(*result['config']):>28}"
+                      f"  val_accuracy {result['val_accuracy']:.4f}  {result['seconds']:>7.1f}s")
+            trained = epochs
+            if rung + 1 < len(rungs):
+                ranked = sorted(survivors, key=lambda config: results[config_key(config)]["val_accuracy"], reverse=True)
+                survivors = ranked[:max(1, math.ceil(len(ranked) / eta))]
+    return results
+
+def write_summary(results, path=SUMMARY_PATH):
+    rows = sorted(results.values(), key=lambda result: result["val_accuracy"], reverse=True)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["conv_layers", "layer_size", "dense_layers", "epochs", "accuracy", "val_accuracy", "seconds"])
+        for result in rows:
+            writer.writerow([*result["config"], result["epochs"], f"{result['accuracy']:.4f}",
+                             f"{result['val_accuracy']:.4f}", f"{result['seconds']:.1f}"])
+
+    print(f"\n{'conv':>4} {'nodes':>5} {'dense':>5} {'epochs':>6} {'val_acc':>8} {'seconds':>8}")
+    for result in rows:
+        conv_layer, layer_size, dense_layer = result["config"]
+        print(f"{conv_layer:>4} {layer_size:>5} {dense_layer:>5} {result['epochs']:>6} "
+              f"{result['val_accuracy']:>8.4f} {result['seconds']:>8.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dense", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--layer-sizes", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--conv-layers", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--epochs", type=int, default=10, help="epochs of the configs that make it to the end")
+    parser.add_argument("--min-epochs", type=int, default=1, help="epochs of the first rung")
+    parser.add_argument("--eta", type=int, default=3, help="keep the best 1/eta configs at each rung")
+    parser.add_argument("--no-halving", action="store_true", help="train every config for all the epochs")
+    parser.add_argument("--workers", type=int, default=None, help="processes, by default cores / threads")
+    parser.add_argument("--threads", type=int, default=None, help="CPU threads per process")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or max(1, cores // (args.threads or 2))
+    threads = args.threads or max(1, cores // workers)
+    configs = [
+        (conv_layer, layer_size, dense_layer)
+        for dense_layer in args.dense for layer_size in args.layer_sizes for conv_layer in args.conv_layers
+    ]
+    rungs = [args.epochs] if args.no_halving else budgets(args.min_epochs, args.epochs, args.eta)
+
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    start = time.perf_counter()
+    results = run_sweep(configs, rungs, args.eta, workers, threads)
+    elapsed = time.perf_counter() - start
+
+    write_summary(results)
+    epochs_trained = sum(result["epochs"] for result in results.values())
+    print(f"\n{len(configs)} configs in {elapsed:.1f}s with {workers} workers x {threads} threads, "
+          f"{epochs_trained} epochs trained instead of {len(configs) * args.epochs}")
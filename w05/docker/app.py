@@ -2,7 +2,44 @@ import streamlit as st
 import pandas as pd
 import pickle
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
+import io
+
+FEATURES = ['SepalLengthCm', 'SepalWidthCm', 'PetalLengthCm', 'PetalWidthCm']
+SPECIES = np.array(['Iris-setosa', 'Iris-versicolor', 'Iris-virginica'])
+PREVIEW_ROWS = 1000
+
+# Loaded once per server process, not on every rerun
+@st.cache_resource
+def load_model(path='iris_clf.pkl'):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def predict(df):
+    """
+    Scores every row in one predict_proba call, the prediction is its most likely class
+    """
+    prediction_proba = load_model().predict_proba(df[FEATURES])
+    return np.argmax(prediction_proba, axis=1), prediction_proba
+
+@st.cache_data(max_entries=4)
+def score_csv(data):
+    """
+    Reads an uploaded CSV and returns its features with the predicted species and
+    probabilities, cached on the file content so reruns don't score it again
+    """
+    df = pd.read_csv(io.BytesIO(data), usecols=lambda column: column in FEATURES)
+    missing = [feature for feature in FEATURES if feature not in df.columns]
+    if missing:
+        raise ValueError(f"The CSV file is missing the columns {', '.join(missing)}")
+    prediction, prediction_proba = predict(df)
+    df['Species'] = SPECIES[prediction]
+    for index, name in enumerate(SPECIES):
+        df[f'P({name})'] = prediction_proba[:, index]
+    return df
+
+@st.cache_data(max_entries=4)
+def to_csv(df):
+    return df.to_csv(index=False).encode()
 
 st.write("""
 Hello, this is a simple Iris Flower Prediction App
@@ -15,7 +52,19 @@ st.sidebar.markdown("""
 
 uploaded_file = st.sidebar.file_uploader("Upload your input CSV file", type=["csv"])
 if uploaded_file is not None:
-    input_df = pd.read_csv(uploaded_file)
+    # Batch mode: every row of the file is scored
+    try:
+        scored_df = score_csv(uploaded_file.getvalue())
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    st.subheader('Predictions')
+    st.write(f"{len(scored_df)} rows scored")
+    st.write(scored_df['Species'].value_counts())
+    st.write(f"First {min(PREVIEW_ROWS, len(scored_df))} rows:")
+    st.dataframe(scored_df.head(PREVIEW_ROWS))
+    st.download_button("Download predictions", to_csv(scored_df), file_name="iris_predictions.csv", mime="text/csv")
 else:
     def user_input_features():
         SepalLengthCm = st.sidebar.slider('SepalLengthCm', 4.3, 8.0, 6.0)
@@ -30,33 +79,20 @@ else:
         }
         features = pd.DataFrame(data, index=[0])
         return features
-    input_df = user_input_features()
-    
-iris_raw = pd.read_csv('iris.csv')
-iris = iris_raw.drop(columns=['Id', 'Species'])
-df = pd.concat([input_df, iris], axis=0)
+    df = user_input_features()
 
-df = df[:1] # Selects only the first row (the user input data)
-
-st.subheader('User Input Features')
-if uploaded_file is not None:
-    st.write(df)
-else:
+    st.subheader('User Input Features')
     st.write('Awaiting CSV file to be uploaded. Currently using example input parameters (shown below).')
     st.write(df)
-    
-    
-# model
-load_clf = pickle.load(open('iris_clf.pkl', 'rb'))
-prediction = load_clf.predict(df)
-prediction_proba = load_clf.predict_proba(df)
-
-st.subheader('Prediction')
-species = np.array(['Iris-setosa', 'Iris-versicolor', 'Iris-virginica'])
-st.write(species[prediction])
-
-st.subheader('Prediction Probability')
-st.write(prediction_proba)
+
+    prediction, prediction_proba = predict(df)
+
+    st.subheader('Prediction')
+    st.write(SPECIES[prediction])
+
+    st.subheader('Prediction Probability')
+    st.write(prediction_proba)
+
 st.write("""
 The app is developed by [Your Name].
-""")
\ No newline at end of file
+""")
@@ -0,0 +1,77 @@
+"""
+Load test of the iris scoring service
+
+Sends requests of random iris rows from many concurrent connections and
+reports the throughput and latency percentiles seen by the clients, then
+the server's own /metrics. Start the service in the container first:
+    docker build -t iris-app .
+    docker run --rm -p 8000:8000 iris-app uvicorn scoring_server:app --host 0.0.0.0 --port 8000
+    python load_test.py --concurrency 32 --requests 5000 --rows 1
+    python load_test.py --rows 1000 --csv
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+FEATURES = ['SepalLengthCm', 'SepalWidthCm', 'PetalLengthCm', 'PetalWidthCm']
+RANGES = [(4.3, 7.9), (2.0, 4.4), (1.0, 6.9), (0.1, 2.5)]
+
+def random_rows(count, rng):
+    return [[round(rng.uniform(low, high), 1) for low, high in RANGES] for _ in range(count)]
+
+def encode(rows, csv):
+    if csv:
+        lines = [",".join(FEATURES)] + [",".join(map(str, row)) for row in rows]
+        return "\n".join(lines).encode(), "text/csv"
+    return json.dumps({"rows": rows}).encode(), "application/json"
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run(url, concurrency, requests, rows, csv):
+    target = urlparse(url)
+    local = threading.local()
+    rng = random.Random(0)
+    # Bodies are built up front so the clients only measure the service
+    bodies = [encode(random_rows(rows, rng), csv) for _ in range(min(requests, 100))]
+
+    def send(index):
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection(target.hostname, target.port or 80)
+        body, content_type = bodies[index % len(bodies)]
+        start = time.perf_counter()
+        local.connection.request("POST", "/predict", body=body, headers={"Content-Type": content_type})
+        response = local.connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(send, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{requests} requests of {rows} rows in {elapsed:.2f}s from {concurrency} connections")
+    print(f"  {requests / elapsed:.0f} requests/s, {requests * rows / elapsed:.0f} rows/s")
+    print("  latency " + ", ".join(f"p{int(q * 100)} {percentile(latencies, q) * 1000:.2f} ms" for q in (0.5, 0.95, 0.99)))
+
+    connection = http.client.HTTPConnection(target.hostname, target.port or 80)
+    connection.request("GET", "/metrics")
+    print("Server metrics:")
+    print(json.dumps(json.loads(connection.getresponse().read()), indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=1, help="rows per request")
+    parser.add_argument("--csv", action="store_true", help="send CSV instead of JSON")
+    args = parser.parse_args()
+    run(args.url, args.concurrency, args.requests, args.rows, args.csv)
@@ -0,0 +1,202 @@
+"""
+Lightweight HTTP scoring service for the iris classifier
+
+Loads iris_clf.pkl once at startup. Concurrent requests are queued and
+scored together: the batcher waits at most MAX_WAIT_MS for more rows, up to
+MAX_BATCH_ROWS, and runs a single predict_proba for all of them.
+
+    uvicorn scoring_server:app --host 0.0.0.0 --port 8000
+
+POST /predict takes JSON or CSV (Content-Type: text/csv, with a header row):
+    {"SepalLengthCm": 5.1, "SepalWidthCm": 3.5, "PetalLengthCm": 1.4, "PetalWidthCm": 0.2}
+    {"rows": [[5.1, 3.5, 1.4, 0.2], {"SepalLengthCm": 6.7, ...}]}
+GET /metrics reports the request latencies, batch sizes and throughput.
+"""
+import asyncio
+import io
+import pickle
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request
+
+MODEL_PATH = 'iris_clf.pkl'
+FEATURES = ['SepalLengthCm', 'SepalWidthCm', 'PetalLengthCm', 'PetalWidthCm']
+SPECIES = np.array(['Iris-setosa', 'Iris-versicolor', 'Iris-virginica'])
+MAX_BATCH_ROWS = 4096
+MAX_WAIT_MS = 2
+LATENCY_WINDOW = 10_000 # latest requests the percentiles are computed over
+
+class Metrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.predict_seconds = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record_batch(self, rows, seconds):
+        self.batches += 1
+        self.batch_rows += rows
+        self.predict_seconds += seconds
+
+    def record_request(self, rows, seconds):
+        self.requests += 1
+        self.rows += rows
+        self.latencies.append(seconds)
+
+    def report(self):
+        uptime = time.perf_counter() - self.started
+        latencies_ms = np.array(self.latencies) * 1000
+        percentiles = np.percentile(latencies_ms, [50, 95, 99]) if len(latencies_ms) else [0, 0, 0]
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "rows": self.rows,
+            "requests_per_s": self.requests / uptime,
+            "rows_per_s": self.rows / uptime,
+            "batches": self.batches,
+            "mean_batch_rows": self.batch_rows / self.batches if self.batches else 0,
+            "mean_predict_ms": self.predict_seconds / self.batches * 1000 if self.batches else 0,
+            "latency_ms": dict(zip(["p50", "p95", "p99"], map(float, percentiles))),
+        }
+
+class MicroBatcher:
+    """
+    Collects the rows of concurrent requests and scores them with one predict_proba call
+    """
+    def __init__(self, model, metrics):
+        self.model = model
+        self.metrics = metrics
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+    async def predict(self, rows):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + MAX_WAIT_MS / 1000
+            while size < MAX_BATCH_ROWS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            batch = np.concatenate([rows for rows, _ in pending])
+            start = time.perf_counter()
+            try:
+                # Scored in a thread so the event loop keeps accepting requests
+                probabilities = await loop.run_in_executor(None, self.predict_proba, batch)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.metrics.record_batch(len(batch), time.perf_counter() - start)
+
+            offset = 0
+            for rows, future in pending:
+                if not future.done():
+                    future.set_result(probabilities[offset:offset + len(rows)])
+                offset += len(rows)
+
+    def predict_proba(self, batch):
+        return self.model.predict_proba(pd.DataFrame(batch, columns=FEATURES))
+
+def parse_json(payload):
+    """
+    Returns the feature rows of a JSON payload as a float array
+    """
+    if isinstance(payload, dict) and "rows" in payload:
+        rows = payload["rows"]
+    elif isinstance(payload, list):
+        rows = payload
+    else:
+        rows = [payload]
+    try:
+        array = np.array(
+            [[row[feature] for feature in FEATURES] if isinstance(row, dict) else row for row in rows],
+            dtype=np.float64,
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Rows need the features {', '.join(FEATURES)}: {e}")
+    if len(rows) and (array.ndim != 2 or array.shape[1] != len(FEATURES)):
+        raise HTTPException(status_code=400, detail=f"Every row needs the {len(FEATURES)} features {', '.join(FEATURES)}")
+    return array.reshape(-1, len(FEATURES))
+
+def parse_csv(body):
+    try:
+        df = pd.read_csv(io.BytesIO(body), usecols=FEATURES)
+        return df[FEATURES].to_numpy(dtype=np.float64)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"CSV needs numeric columns {', '.join(FEATURES)}: {e}")
+
+@asynccontextmanager
+async def lifespan(app):
+    # The model is unpickled once, every request reuses it
+    with open(MODEL_PATH, 'rb') as f:
+        model = pickle.load(f)
+    app.state.metrics = Metrics()
+    app.state.batcher = MicroBatcher(model, app.state.metrics)
+    app.state.batcher.start()
+    yield
+    await app.state.batcher.stop()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+@app.get("/metrics")
+def metrics():
+    return app.state.metrics.report()
+
+@app.post("/predict")
+async def predict(request: Request):
+    start = time.perf_counter()
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        rows = parse_csv(body)
+    else:
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body is not valid JSON")
+        rows = parse_json(payload)
+    if not len(rows):
+        raise HTTPException(status_code=400, detail="No rows to score")
+    if not np.isfinite(rows).all():
+        raise HTTPException(status_code=400, detail="Features must be finite numbers")
+
+    probabilities = await app.state.batcher.predict(rows)
+    app.state.metrics.record_request(len(rows), time.perf_counter() - start)
+    return {
+        "predictions": SPECIES[np.argmax(probabilities, axis=1)].tolist(),
+        "probabilities": probabilities.tolist(),
+    }
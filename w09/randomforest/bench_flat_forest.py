@@ -0,0 +1,85 @@
+"""
+Benchmark of FlatForest against sklearn's RandomForestClassifier
+
+For each pickled model, times predict_proba on single rows and on a large
+batch with sklearn and with the exported flat arrays, and checks both give
+identical probabilities. The rows are drawn uniformly around the split
+thresholds of the forest, so every branch gets exercised. A forest of
+shallow trees, whose leaves mix classes, is checked the same way first.
+Run from this folder:
+    python bench_flat_forest.py random_forest_model.pkl random_forest_model_3d.pkl ../../w05/docker/iris_clf.pkl
+"""
+import argparse
+import time
+import warnings
+import joblib
+import numpy as np
+from flat_forest import FlatForest
+
+def random_rows(model, count, seed=0):
+    rng = np.random.default_rng(seed)
+    low, high = [], []
+    for feature in range(model.n_features_in_):
+        thresholds = np.concatenate([
+            estimator.tree_.threshold[estimator.tree_.feature == feature] for estimator in model.estimators_
+        ])
+        low.append(thresholds.min() - 1 if len(thresholds) else 0)
+        high.append(thresholds.max() + 1 if len(thresholds) else 1)
+    return rng.uniform(low, high, size=(count, model.n_features_in_))
+
+def impure_leaves_identical(rows=10_000, seed=0):
+    """
+    Fits a forest of depth 5 trees on noisy labels, so leaves hold class fractions
+    rather than 0 and 1, and checks the flat arrays predict the same
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, 4))
+    y = (X[:, 0] + X[:, 1] + rng.normal(size=rows) > 0).astype(int) + (X[:, 2] > 1)
+    model = RandomForestClassifier(n_estimators=50, max_depth=5, random_state=seed).fit(X, y)
+    forest = FlatForest.from_sklearn(model)
+    return np.array_equal(model.predict_proba(X), forest.predict_proba(X)) and np.array_equal(
+        model.predict(X), forest.predict(X)
+    )
+
+def median_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("models", nargs="+")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single", type=int, default=200, help="single row calls to time")
+    args = parser.parse_args()
+
+    # The iris model was fitted on a DataFrame and warns about arrays without feature names
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    print(f"depth 5 forest with impure leaves, identical: {impure_leaves_identical()}")
+    for path in args.models:
+        model = joblib.load(path)
+        forest = FlatForest.from_sklearn(model)
+        X = random_rows(model, args.rows)
+        single_rows = X[:args.single]
+
+        sklearn_proba = model.predict_proba(X)
+        identical = np.array_equal(sklearn_proba, forest.predict_proba(X))
+        identical &= np.array_equal(model.predict(X), forest.predict(X))
+
+        rows = iter(np.tile(single_rows, (3, 1)))
+        sklearn_single = median_time(lambda: model.predict_proba(next(rows)[np.newaxis]), args.single)
+        rows = iter(np.tile(single_rows, (3, 1)))
+        flat_single = median_time(lambda: forest.predict_proba(next(rows)[np.newaxis]), args.single)
+        sklearn_batch = median_time(lambda: model.predict_proba(X), 3)
+        flat_batch = median_time(lambda: forest.predict_proba(X), 3)
+
+        print(f"{path}: {len(forest.roots)} trees, {len(forest.feature)} nodes, identical: {identical}")
+        print(f"  {'1 row':>12}  sklearn {sklearn_single * 1000:>9.3f} ms  flat {flat_single * 1000:>9.3f} ms"
+              f"  {sklearn_single / flat_single:>6.1f}x")
+        print(f"  {f'{args.rows} rows':>12}  sklearn {sklearn_batch * 1000:>9.1f} ms  flat {flat_batch * 1000:>9.1f} ms"
+              f"  {sklearn_batch / flat_batch:>6.1f}x")